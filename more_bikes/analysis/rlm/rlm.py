@@ -2,15 +2,17 @@
 
 # pylint: disable=redefined-outer-name
 
-from pandas import DataFrame, concat, read_csv
+from numpy import column_stack, float64
+from pandas import DataFrame, read_csv
 from sklearn import set_config
+from sklearn.base import clone
 from sklearn.impute import SimpleImputer
 from sklearn.metrics import make_scorer, mean_absolute_error
 from sklearn.model_selection import cross_val_score
 from sklearn.pipeline import make_pipeline
 
 from more_bikes.data.data_loader import DataLoaderTrainN
-from more_bikes.data.model_loader import get_estimator_ids
+from more_bikes.data.model_loader import RLMEngine, get_rlm_engine
 from more_bikes.experiments.experiment import Model, Processing
 from more_bikes.experiments.params.cv import time_series_split
 from more_bikes.experiments.task_2.stacking_regressor import StackingRegressor
@@ -20,6 +22,8 @@ from more_bikes.feature_selection.variance_threshold import (
 )
 from more_bikes.preprocessing.ordinal_transformer import preprocessing_ordinal
 from more_bikes.preprocessing.util import pre_chain, split
+from more_bikes.util.array import NDArray
+from more_bikes.util.results import ResultsSink
 
 
 def get_rlm_score(model: Model, processing: Processing = Processing()):
@@ -38,105 +42,78 @@ def get_rlm_score(model: Model, processing: Processing = Processing()):
     return scores, scores.mean()
 
 
-def save_rlm_scores():
-    """Score all RLM models."""
+def get_rlm_scores(
+    engine: RLMEngine, processing: Processing = Processing()
+) -> NDArray[float64]:
+    """
+    Score all RLM models at once, as a (models, splits) matrix.
 
-    rlm_scores = DataFrame(
-        {
-            "model": [],
-            "station": [],
-            "split": [],
-            "score": [],
-        }
-    )
+    The data is loaded and pre-processed once per split, and every model is scored by
+    one matrix product, rather than by a pipeline per model.
+    """
 
-    rlm_mean_scores = DataFrame(
-        {
-            "model": [],
-            "station": [],
-            "score": [],
-        }
+    x_train, y_train = split(pre_chain(processing.pre)(DataLoaderTrainN().data))
+
+    pipeline = make_pipeline(
+        # preprocessing
+        clone(preprocessing_ordinal),
+        SimpleImputer(keep_empty_features=True),
+        # feature selection
+        clone(feature_selection_variance_threshold),
+        feature_selection_drop(["wind_speed_avg"]),
     )
 
-    for name, station, estimator in get_estimator_ids():
-        model = Model(
-            name=f"{name}_{station}",
-            pipeline=make_pipeline(
-                # preprocessing
-                preprocessing_ordinal,
-                SimpleImputer(keep_empty_features=True),
-                # feature selection
-                feature_selection_variance_threshold,
-                feature_selection_drop(["wind_speed_avg"]),
-                # regression
-                estimator,
-            ),
-        )
+    scores: list[NDArray[float64]] = []
 
-        scores, mean_score = get_rlm_score(model)
+    for train, test in time_series_split.split(x_train):
+        pipeline.fit(x_train.iloc[train], y_train.iloc[train])
 
-        print(f"{name} {station}".ljust(20) + f"{mean_score:.3f}")
+        y_pred = engine.predict(pipeline.transform(x_train.iloc[test]))
+        y_true = y_train.iloc[test].to_numpy(float64)
 
-        rlm_scores = concat(
-            [
-                rlm_scores,
-                DataFrame(
-                    {
-                        "model": name,
-                        "station": station,
-                        "split": range(len(scores)),
-                        "score": scores,
-                    }
-                ),
-            ]
-        )
+        scores.append(abs(y_pred - y_true[:, None]).mean(axis=0))
 
-        rlm_mean_scores = concat(
-            [
-                rlm_mean_scores,
-                DataFrame(
-                    {
-                        "model": name,
-                        "station": station,
-                        "score": [mean_score],
-                    }
-                ),
-            ]
-        )
+    return column_stack(scores)
 
-    rlm_scores["station"] = rlm_scores["station"].astype(int)
-    rlm_scores["split"] = rlm_scores["split"].astype(int)
 
-    rlm_mean_scores["station"] = rlm_mean_scores["station"].astype(int)
+def save_rlm_scores():
+    """Score all RLM models."""
 
-    rlm_scores.to_csv(
-        "more_bikes/analysis/rlm/rlm_scores.csv",
-        index=False,
+    rlm_scores = ResultsSink(
+        ["model", "station", "split", "score"],
+        path="more_bikes/analysis/rlm/rlm_scores.csv",
+        dtype={"station": int, "split": int},
     )
 
-    rlm_mean_scores.to_csv(
-        "more_bikes/analysis/rlm/rlm_mean_scores.csv",
-        index=False,
+    rlm_mean_scores = ResultsSink(
+        ["model", "station", "score"],
+        path="more_bikes/analysis/rlm/rlm_mean_scores.csv",
+        dtype={"station": int},
     )
 
+    engine = get_rlm_engine()
+
+    scoress = get_rlm_scores(engine)
+
+    for (station, name), row in engine.index.items():
+        scores = scoress[row]
+        mean_score = scores.mean()
+
+        print(f"{name} {station}".ljust(20) + f"{mean_score:.3f}")
+
+        rlm_scores.extend(
+            model=name, station=station, split=range(len(scores)), score=scores
+        )
+
+        rlm_mean_scores.append(model=name, station=station, score=mean_score)
+
 
 def save_stacked_rlm_scores():
     """Score all stacked RLM models."""
 
-    stacked_rlm_scores = DataFrame(
-        {
-            "model": [],
-            "split": [],
-            "score": [],
-        }
-    )
+    stacked_rlm_scores = ResultsSink(["model", "split", "score"], dtype={"split": int})
 
-    stacked_rlm_mean_scores = DataFrame(
-        {
-            "model": [],
-            "score": [],
-        }
-    )
+    stacked_rlm_mean_scores = ResultsSink(["model", "score"])
 
     for rlm_models in [
         ["full"],
@@ -166,39 +143,16 @@ def save_stacked_rlm_scores():
 
         print(name.ljust(20) + f"{mean_score:.3f}")
 
-        stacked_rlm_scores = concat(
-            [
-                stacked_rlm_scores,
-                DataFrame(
-                    {
-                        "model": name,
-                        "split": range(len(scores)),
-                        "score": scores,
-                    }
-                ),
-            ]
-        )
-
-        stacked_rlm_mean_scores = concat(
-            [
-                stacked_rlm_mean_scores,
-                DataFrame(
-                    {
-                        "model": name,
-                        "score": [mean_score],
-                    }
-                ),
-            ]
-        )
+        stacked_rlm_scores.extend(model=name, split=range(len(scores)), score=scores)
 
-    stacked_rlm_scores["split"] = stacked_rlm_scores["split"].astype(int)
+        stacked_rlm_mean_scores.append(model=name, score=mean_score)
 
-    stacked_rlm_scores.to_csv(
+    stacked_rlm_scores.frame().to_csv(
         "more_bikes/analysis/rlm/stacked_rlm_scores.csv",
         index=False,
     )
 
-    stacked_rlm_mean_scores.to_csv(
+    stacked_rlm_mean_scores.frame().to_csv(
         "more_bikes/analysis/rlm/stacked_rlm_mean_scores.csv",
         index=False,
     )
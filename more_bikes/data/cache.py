@@ -0,0 +1,136 @@
+"""On-disk columnar cache for parsed CSVs."""
+
+from glob import glob
+from hashlib import sha1
+from os import getpid, makedirs, remove, replace, stat
+from os.path import abspath, basename, dirname, join, realpath, splitext
+from typing import Any, Callable, Mapping
+
+from numpy import load, savez
+from pandas import Categorical, CategoricalDtype, DataFrame, isna
+
+# The suffix of the mask that records the missing values of an object column.
+NA = ".na"
+
+# The suffixes of the categories and order of a categorical column.
+CATEGORIES = ".categories"
+ORDERED = ".ordered"
+
+
+def cache_key(path: str, names: tuple[str, ...], dtype: Mapping[str, Any]) -> str:
+    """The key of a CSV: its path, modification time and size, and the schema."""
+    source = stat(path)
+    return sha1(
+        repr(
+            (
+                abspath(path),
+                source.st_mtime_ns,
+                source.st_size,
+                names,
+                sorted((name, repr(value)) for name, value in dtype.items()),
+            )
+        ).encode("utf-8")
+    ).hexdigest()
+
+
+def cache_path(cache_dir: str, path: str, key: str) -> str:
+    """
+    The path of the cached columns of a CSV, named by its file name and a hash of its
+    resolved path, so that CSVs of the same name in other directories do not share it.
+    """
+    source = sha1(realpath(path).encode("utf-8")).hexdigest()[:16]
+    return join(cache_dir, f"{splitext(basename(path))[0]}-{source}-{key}.npz")
+
+
+def write_columns(path: str, data: DataFrame) -> None:
+    """Write the columns of a DataFrame to an `.npz` bundle."""
+    columns: dict[str, Any] = {}
+
+    for name in data.columns:
+        column = data[name]
+
+        # Store categorical columns as codes, categories and order.
+        if isinstance(column.dtype, CategoricalDtype):
+            columns[name] = column.cat.codes.to_numpy()
+            columns[f"{name}{CATEGORIES}"] = column.cat.categories.to_numpy(str)
+            columns[f"{name}{ORDERED}"] = column.cat.ordered
+            continue
+
+        values = column.to_numpy()
+
+        # Store object (string) columns as fixed-width unicode and a mask.
+        if values.dtype == object:
+            mask = isna(values)
+            values = values.copy()
+            values[mask] = ""
+            columns[f"{name}{NA}"] = mask
+            values = values.astype(str)
+
+        columns[name] = values
+
+    # Write to a temporary file and move it, so that readers never see a partial file.
+    makedirs(dirname(abspath(path)), exist_ok=True)
+    temp = f"{path}.{getpid()}.tmp"
+    with open(temp, "wb") as file:
+        savez(file, **columns)
+    replace(temp, path)
+
+
+def read_columns(path: str, names: tuple[str, ...]) -> DataFrame:
+    """Read the columns of a DataFrame from an `.npz` bundle."""
+    with load(path, allow_pickle=False) as bundle:
+        columns: dict[str, Any] = {}
+
+        for name in names:
+            values = bundle[name]
+
+            if f"{name}{CATEGORIES}" in bundle:
+                values = Categorical.from_codes(
+                    values,
+                    categories=bundle[f"{name}{CATEGORIES}"].astype(object),
+                    ordered=bool(bundle[f"{name}{ORDERED}"]),
+                )
+
+            elif f"{name}{NA}" in bundle:
+                values = values.astype(object)
+                values[bundle[f"{name}{NA}"]] = float("nan")
+
+            columns[name] = values
+
+    return DataFrame(columns)
+
+
+def read_cached(
+    path: str,
+    cache_dir: str,
+    read: Callable[[], DataFrame],
+    names: tuple[str, ...],
+    dtype: Mapping[str, Any],
+) -> DataFrame:
+    """
+    Read a CSV from the cache, or read it with `read` and cache it.
+
+    Entries are keyed by the source path, modification time and schema, so an entry is
+    rebuilt automatically when its source changes.
+    """
+    key = cache_key(path, names, dtype)
+    cached = cache_path(cache_dir, path, key)
+
+    try:
+        return read_columns(cached, names)
+    except (FileNotFoundError, KeyError, ValueError, OSError):
+        pass
+
+    data = read()
+
+    # Remove stale entries for the same source.
+    for stale in glob(cache_path(cache_dir, path, "*")):
+        if stale != cached:
+            try:
+                remove(stale)
+            except FileNotFoundError:
+                pass
+
+    write_columns(cached, data)
+
+    return data
@@ -0,0 +1,82 @@
+"""Test the columnar cache."""
+
+from dataclasses import replace
+from glob import glob
+from os import utime
+
+from pandas.testing import assert_frame_equal
+
+from .data_loader import ReadOptions, read_data
+from .feature import FEATURE_TRAIN
+
+ROW = (
+    "201,39.4,-0.3,20,1412114400,2014,10,1,0,Wednesday,49,0,"
+    "0.0,0.0,NA,21.3,89.0,1016.0,0.0,NA,NA,NA,NA,NA,1"
+)
+
+
+def write_csv(path, rows: list[str]) -> None:
+    """Write rows to a CSV with the training header."""
+    path.write_text(
+        "\n".join([",".join(FEATURE_TRAIN), *rows]) + "\n", encoding="utf-8"
+    )
+
+
+def test_read_cached(tmp_path):
+    """Test that the cache returns the parsed CSV and rebuilds when it changes."""
+
+    path = tmp_path / "station_201_deploy.csv"
+    write_csv(path, [ROW])
+
+    cache_dir = str(tmp_path / "cache")
+    options = ReadOptions(cache_dir=cache_dir)
+
+    expected = read_data(str(path), FEATURE_TRAIN)
+
+    assert_frame_equal(read_data(str(path), FEATURE_TRAIN, options), expected)
+    assert_frame_equal(read_data(str(path), FEATURE_TRAIN, options), expected)
+    assert len(glob(f"{cache_dir}/*.npz")) == 1
+
+    write_csv(path, [ROW, ROW.replace("Wednesday", "Thursday")])
+    utime(path, ns=(0, 1))
+
+    data = read_data(str(path), FEATURE_TRAIN, options)
+
+    assert data.shape == (2, 25)
+    assert list(data["weekday"]) == ["Wednesday", "Thursday"]
+    assert len(glob(f"{cache_dir}/*.npz")) == 1
+
+
+def test_read_cached_compact(tmp_path):
+    """Test that the cache preserves the compact schema."""
+
+    path = tmp_path / "station_201_deploy.csv"
+    write_csv(path, [ROW, ROW.replace("Wednesday", "Thursday")])
+
+    options = ReadOptions(cache_dir=str(tmp_path / "cache"), compact=True, float32=True)
+
+    expected = read_data(str(path), FEATURE_TRAIN, replace(options, cache_dir=None))
+
+    assert_frame_equal(read_data(str(path), FEATURE_TRAIN, options), expected)
+    assert_frame_equal(read_data(str(path), FEATURE_TRAIN, options), expected)
+    assert expected["weekday"].cat.ordered
+    assert expected["weekday"].cat.codes.tolist() == [2, 3]
+
+
+def test_read_cached_same_name(tmp_path):
+    """Test that CSVs of the same name in other directories have their own entries."""
+
+    cache_dir = str(tmp_path / "cache")
+    options = ReadOptions(cache_dir=cache_dir)
+
+    paths = [tmp_path / name / "station_201_deploy.csv" for name in ["a", "b"]]
+    for path, weekday in zip(paths, ["Wednesday", "Thursday"]):
+        path.parent.mkdir()
+        write_csv(path, [ROW.replace("Wednesday", weekday)])
+
+    for _ in range(2):
+        for path, weekday in zip(paths, ["Wednesday", "Thursday"]):
+            data = read_data(str(path), FEATURE_TRAIN, options)
+            assert list(data["weekday"]) == [weekday]
+
+    assert len(glob(f"{cache_dir}/*.npz")) == 2
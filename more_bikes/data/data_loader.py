@@ -1,18 +1,147 @@
 """Data-loader classes."""
 
 from abc import ABCMeta, abstractmethod
-from functools import cached_property
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from os import stat
 
+from joblib import Parallel, delayed
+from numpy import append, unique
 from pandas import DataFrame, concat, read_csv
 
-from more_bikes.data.feature import FEATURE_DTYPE, FEATURE_TEST, FEATURE_TRAIN
+from more_bikes.data.cache import read_cached
+from more_bikes.data.feature import (
+    FEATURE_TEST,
+    FEATURE_TRAIN,
+    feature_dtype,
+    ordinal_codes,
+)
+
+
+@dataclass(frozen=True)
+class ReadOptions:
+    """Options to read the data."""
+
+    # If set, the directory of an on-disk columnar cache of the parsed CSVs.
+    cache_dir: str | None = None
+
+    # The number of threads to read multiple CSVs in parallel (as for `joblib`).
+    n_jobs: int | None = None
+
+    # If set, read `weekday` as an ordered categorical and small integers narrowly.
+    compact: bool = False
+
+    # If set, read the weather and profile features as `float32`.
+    float32: bool = False
+
+    # If set, encode the categorical features as their ordinal codes (`int8`).
+    encode: bool = False
+
+
+def read_data(
+    path: str, names: tuple[str, ...], options: ReadOptions = ReadOptions()
+) -> DataFrame:
+    """Read a CSV to a DataFrame."""
+    dtype = feature_dtype(options.compact, options.float32)
+
+    def read() -> DataFrame:
+        return read_csv(
+            filepath_or_buffer=path,
+            header=0,
+            names=names,
+            dtype=dtype,  # type: ignore
+            na_values="NA",
+        )
+
+    data = (
+        read()
+        if options.cache_dir is None
+        else read_cached(path, options.cache_dir, read, names, dtype)
+    )
+
+    return encode_ordinal(data) if options.encode else data
+
+
+def encode_ordinal(data: DataFrame) -> DataFrame:
+    """Replace the categorical features by their ordinal codes."""
+    for feature, codes in ordinal_codes.items():
+        if feature not in data.columns:
+            continue
+
+        # Map the categories of a categorical, rather than each value.
+        encoded = data[feature].map(codes)
+        if encoded.isna().any():
+            raise ValueError(f"Found unknown categories in {feature}.")
+
+        data[feature] = encoded.astype("int8")
+
+    return data
+
+
+def concat_by_timestamp(frames: list[DataFrame]) -> DataFrame:
+    """
+    Concatenate DataFrames into one sorted by timestamp, in the same row order however
+    the DataFrames were read (e.g., in parallel).
+    """
+    return concat(frames, ignore_index=True, sort=False).sort_values(by=["timestamp"])
+
+
+def read_data_n(
+    paths: list[str], names: tuple[str, ...], options: ReadOptions = ReadOptions()
+) -> DataFrame:
+    """Read CSVs, in parallel if `options.n_jobs` is set, to a DataFrame."""
+    if options.n_jobs is None:
+        frames = [read_data(path, names, options) for path in paths]
+    else:
+        frames = Parallel(n_jobs=options.n_jobs, prefer="threads")(
+            delayed(read_data)(path, names, options) for path in paths
+        )
+    return concat_by_timestamp(list(frames))  # type: ignore
+
+
+class TestSetStore:
+    """The test set, parsed once and indexed by station."""
+
+    def __init__(self, data: DataFrame) -> None:
+        self.data = data
+
+        # Sort by station, then index each station's rows by a slice.
+        self.by_station = data.sort_values(by=["station", "timestamp"], kind="stable")
+        stations = self.by_station["station"].to_numpy()
+        station_ids, starts = unique(stations, return_index=True)
+        stops = append(starts[1:], len(stations))
+        self.index: dict[int, slice] = {
+            int(station_id): slice(start, stop)
+            for station_id, start, stop in zip(station_ids, starts, stops)
+        }
+
+    @cached_property
+    def by_timestamp(self) -> DataFrame:
+        """The test set, sorted by timestamp."""
+        return self.data.sort_values(by=["timestamp"])
+
+    def station(self, station_id: int) -> DataFrame:
+        """The rows for a station, sorted by timestamp (a view, not a copy)."""
+        return self.by_station.iloc[self.index.get(station_id, slice(0, 0))]
+
+
+@lru_cache(maxsize=4)
+def _read_test_set_store(
+    path: str, _mtime_ns: int, options: ReadOptions
+) -> TestSetStore:
+    return TestSetStore(read_data(path, FEATURE_TEST, options))
+
+
+def get_test_set_store(path: str, options: ReadOptions = ReadOptions()) -> TestSetStore:
+    """Get the process-wide store of a test set, re-reading it if it changes."""
+    return _read_test_set_store(path, stat(path).st_mtime_ns, options)
 
 
 class DataLoader(metaclass=ABCMeta):
     """Abstract data-loader class."""
 
-    def __init__(self) -> None:
-        pass
+    def __init__(self, options: ReadOptions = ReadOptions()) -> None:
+        self.options = options
 
     @property
     @abstractmethod
@@ -23,27 +152,27 @@ class DataLoader(metaclass=ABCMeta):
 class DataLoaderTrain1(DataLoader):
     """Train data loader for a single station."""
 
-    def __init__(self, station_id: int):
-        super().__init__()
+    def __init__(self, station_id: int, options: ReadOptions = ReadOptions()):
+        super().__init__(options)
         self.station_id = station_id
         self.path = f"data/train/station_{station_id}_deploy.csv"
 
     @cached_property
     def data(self):
-        return read_csv(
-            filepath_or_buffer=self.path,
-            header=0,
-            names=FEATURE_TRAIN,
-            dtype=FEATURE_DTYPE,
-            na_values="NA",
-        ).sort_values(by=["timestamp"])
+        return read_data(self.path, FEATURE_TRAIN, self.options).sort_values(
+            by=["timestamp"]
+        )
 
 
 class DataLoaderTrainN(DataLoader):
     """Train data loader for multiple stations."""
 
-    def __init__(self, station_ids: list[int] | None = None):
-        super().__init__()
+    def __init__(
+        self,
+        station_ids: list[int] | None = None,
+        options: ReadOptions = ReadOptions(),
+    ):
+        super().__init__(options)
         self.station_ids = station_ids or list(range(201, 274))
         self.paths = [
             f"data/train/station_{station_id}_deploy.csv"
@@ -52,83 +181,62 @@ class DataLoaderTrainN(DataLoader):
 
     @cached_property
     def data(self):
-        return concat(
-            [
-                read_csv(
-                    filepath_or_buffer=path,
-                    header=0,
-                    names=FEATURE_TRAIN,
-                    dtype=FEATURE_DTYPE,
-                    na_values="NA",
-                )
-                for path in self.paths
-            ],
-            ignore_index=True,
-        ).sort_values(by=["timestamp"])
+        return read_data_n(self.paths, FEATURE_TRAIN, self.options)
 
 
 class DataLoaderTest1(DataLoader):
     """Test data loader for a single station."""
 
-    def __init__(self, station_id: int):
-        super().__init__()
+    def __init__(self, station_id: int, options: ReadOptions = ReadOptions()):
+        super().__init__(options)
         self.path = "data/test.csv"
         self.station_id = station_id
 
     @cached_property
     def data(self) -> DataFrame:
-        data = read_csv(
-            filepath_or_buffer=self.path,
-            header=0,
-            names=FEATURE_TEST,
-            dtype=FEATURE_DTYPE,
-            na_values="NA",
+        # A copy, so that a caller that changes it does not change the shared store.
+        return (
+            get_test_set_store(self.path, self.options).station(self.station_id).copy()
         )
-        return data[data["station"] == self.station_id].sort_values(by=["timestamp"])
 
 
 class DataLoaderTestN(DataLoader):
     """Test data loader for multiple stations."""
 
-    def __init__(self):
-        super().__init__()
+    def __init__(self, options: ReadOptions = ReadOptions()):
+        super().__init__(options)
         self.path = "data/test.csv"
 
     @cached_property
     def data(self) -> DataFrame:
-        return read_csv(
-            filepath_or_buffer=self.path,
-            header=0,
-            names=FEATURE_TEST,
-            dtype=FEATURE_DTYPE,
-            na_values="NA",
-        ).sort_values(by=["timestamp"])
+        # A copy, so that a caller that changes it does not change the shared store.
+        return get_test_set_store(self.path, self.options).by_timestamp.copy()
 
 
 class DataLoaderFull1(DataLoader):
     """Full data loader for a single station."""
 
-    def __init__(self, station_id: int):
-        super().__init__()
+    def __init__(self, station_id: int, options: ReadOptions = ReadOptions()):
+        super().__init__(options)
         self.station_id = station_id
         self.path = f"data/train/station_{station_id}_train.csv"
 
     @cached_property
     def data(self):
-        return read_csv(
-            filepath_or_buffer=self.path,
-            header=0,
-            names=FEATURE_TRAIN,
-            dtype=FEATURE_DTYPE,
-            na_values="NA",
-        ).sort_values(by=["timestamp"])
+        return read_data(self.path, FEATURE_TRAIN, self.options).sort_values(
+            by=["timestamp"]
+        )
 
 
 class DataLoaderFullN(DataLoader):
     """Full data loader for multiple stations."""
 
-    def __init__(self, station_ids: list[int] | None = None):
-        super().__init__()
+    def __init__(
+        self,
+        station_ids: list[int] | None = None,
+        options: ReadOptions = ReadOptions(),
+    ):
+        super().__init__(options)
         self.station_ids = station_ids or list(range(1, 11))
         self.paths = [
             f"data/train/station_{station_id}_train.csv"
@@ -137,32 +245,17 @@ class DataLoaderFullN(DataLoader):
 
     @cached_property
     def data(self):
-        return concat(
-            [
-                read_csv(
-                    filepath_or_buffer=path,
-                    header=0,
-                    names=FEATURE_TRAIN,
-                    dtype=FEATURE_DTYPE,
-                    na_values="NA",
-                )
-                for path in self.paths
-            ],
-            ignore_index=True,
-        ).sort_values(by=["timestamp"])
+        return read_data_n(self.paths, FEATURE_TRAIN, self.options)
 
 
 class DataLoaderAll(DataLoader):
     """Data loader for all sources."""
 
-    def __init__(self):
-        super().__init__()
-        self.train = DataLoaderTrainN()
-        self.full = DataLoaderFullN()
+    def __init__(self, options: ReadOptions = ReadOptions()):
+        super().__init__(options)
+        self.train = DataLoaderTrainN(options=options)
+        self.full = DataLoaderFullN(options=options)
 
     @cached_property
     def data(self):
-        data = concat(
-            [self.train.data, self.full.data], ignore_index=True, sort=False
-        ).sort_values(by=["timestamp"])
-        return data
+        return concat_by_timestamp([self.train.data, self.full.data])
@@ -1,5 +1,9 @@
 """Test the data-loader classes."""
 
+from pandas import concat, read_csv
+from pandas.testing import assert_frame_equal
+
+from more_bikes.data.feature import FEATURE_DTYPE, FEATURE_TRAIN, WEEKDAY
 from more_bikes.preprocessing.util import split
 
 from .data_loader import (
@@ -7,6 +11,7 @@ from .data_loader import (
     DataLoaderTestN,
     DataLoaderTrain1,
     DataLoaderTrainN,
+    ReadOptions,
 )
 
 
@@ -28,6 +33,32 @@ def test_data_loader_train_n():
     assert y.shape == (54385,)
 
 
+def test_data_loader_train_n_order():
+    """Test that the training data is sorted as before, unless read in parallel."""
+
+    station_ids = [201, 202, 203]
+    expected = concat(
+        [
+            read_csv(
+                filepath_or_buffer=f"data/train/station_{station_id}_deploy.csv",
+                header=0,
+                names=FEATURE_TRAIN,
+                dtype=FEATURE_DTYPE,
+                na_values="NA",
+            )
+            for station_id in station_ids
+        ],
+        ignore_index=True,
+    ).sort_values(by=["timestamp"])
+
+    assert_frame_equal(DataLoaderTrainN(station_ids).data, expected)
+
+    # In parallel, in the same order.
+    assert_frame_equal(
+        DataLoaderTrainN(station_ids, options=ReadOptions(n_jobs=2)).data, expected
+    )
+
+
 def test_data_loader_test_1():
     """Test the test data loader for a single station."""
 
@@ -42,3 +73,35 @@ def test_data_loader_test_n():
     x = DataLoaderTestN().data
 
     assert x.shape == (2250, 25)
+
+
+def test_data_loader_test_1_matches_test_n():
+    """Test that the single-station test data matches the full test data."""
+
+    data = DataLoaderTestN().data
+
+    for station_id in [201, 275]:
+        x = DataLoaderTest1(station_id=station_id).data
+
+        assert_frame_equal(x, data[data["station"] == station_id])
+
+
+def test_data_loader_test_copies():
+    """Test that changing the test data does not change later reads."""
+
+    for loader in [lambda: DataLoaderTest1(station_id=201), DataLoaderTestN]:
+        expected = loader().data.copy()
+        loader().data["docks"].to_numpy()[:] = -1
+
+        assert_frame_equal(loader().data, expected)
+
+
+def test_data_loader_encode():
+    """Test that the categorical features can be read as their ordinal codes."""
+
+    data = DataLoaderTrain1(station_id=201).data
+    encoded = DataLoaderTrain1(station_id=201, options=ReadOptions(encode=True)).data
+
+    assert encoded["weekday"].dtype == "int8"
+    assert [WEEKDAY[code] for code in encoded["weekday"]] == list(data["weekday"])
+    assert list(encoded["is_holiday"]) == list(data["is_holiday"].astype(int))
@@ -1,6 +1,8 @@
 """Feature constants."""
 
-from typing import Literal
+from typing import Any, Literal
+
+from pandas import CategoricalDtype
 
 Feature = Literal[
     "station",
@@ -62,7 +64,7 @@ FEATURE_TEST = ("id", *FEATURE)
 
 FEATURE_TRAIN = (*FEATURE, "bikes")
 
-DType = Literal["bool", "float", "int", "str"]
+DType = Literal["bool", "float", "float32", "int", "int8", "int16", "str"]
 
 FEATURE_DTYPE: dict[Feature, DType] = {
     "station": "int",
@@ -96,6 +98,47 @@ BIKES = "bikes"
 
 WEEKDAY = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
 
+# A compact schema: an ordered categorical for `weekday` and narrow integers.
+FEATURE_DTYPE_COMPACT: dict[Feature, DType | CategoricalDtype] = {
+    **FEATURE_DTYPE,
+    "station": "int16",
+    "docks": "int8",
+    "year": "int16",
+    "month": "int8",
+    "day": "int8",
+    "hour": "int8",
+    "weekday": CategoricalDtype(WEEKDAY, ordered=True),
+    "weekhour": "int16",
+}
+
+# The weather and profile features that may be narrowed to `float32`.
+FEATURE_FLOAT32: list[Feature] = [
+    "wind_speed_max",
+    "wind_speed_avg",
+    "wind_direction",
+    "temperature",
+    "humidity",
+    "pressure",
+    "precipitation",
+    "bikes_3h",
+    "bikes_3h_diff_avg_full",
+    "bikes_avg_full",
+    "bikes_3h_diff_avg_short",
+    "bikes_avg_short",
+]
+
+
+def feature_dtype(
+    compact: bool = False, float32: bool = False
+) -> dict[Feature, DType | CategoricalDtype]:
+    """The schema to read features with."""
+    dtype: dict[Feature, DType | CategoricalDtype] = dict(
+        FEATURE_DTYPE_COMPACT if compact else FEATURE_DTYPE
+    )
+    if float32:
+        dtype.update({feature: "float32" for feature in FEATURE_FLOAT32})
+    return dtype
+
 
 categorical_features = ["weekday", "is_holiday"]
 
@@ -112,6 +155,12 @@ categories = [
     [False, True],
 ]
 
+# The ordinal code of each category of each categorical feature, as for `categories`.
+ordinal_codes: dict[str, dict[Any, int]] = {
+    feature: {category: code for code, category in enumerate(feature_categories)}
+    for feature, feature_categories in zip(categorical_features, categories)
+}
+
 numerical_features = [
     "latitude",
     "longitude",
@@ -2,12 +2,19 @@
 
 # pylint:disable=too-few-public-methods,invalid-name
 
-from functools import reduce
-from typing import Sequence, TypeVar
-
+from functools import lru_cache
+from hashlib import sha1
+from itertools import chain, product
+from os import getpid, remove, replace, stat
+from os.path import exists
+from typing import Any, Iterable, Sequence, TypeVar
+
+from numpy import array, bool_, float64, isnan, load, savez, where, zeros
 from pandas import DataFrame, read_csv
 from sklearn.base import BaseEstimator, RegressorMixin
 
+from more_bikes.util.array import NDArray
+
 intercept = "(Intercept)"
 bikes_3h = "bikes_3h_ago"
 bikes_3h_diff_avg_full = "full_profile_3h_diff_bikes"
@@ -18,17 +25,236 @@ temperature = "temperature.C"
 
 columns = ["feature", "weight"]
 
+# The features of the pre-trained models, by their names in the weight files.
+weights = {
+    bikes_3h: "bikes_3h",
+    bikes_3h_diff_avg_full: "bikes_3h_diff_avg_full",
+    bikes_3h_diff_avg_short: "bikes_3h_diff_avg_short",
+    bikes_avg_full: "bikes_avg_full",
+    bikes_avg_short: "bikes_avg_short",
+    temperature: "temperature",
+}
+
+RLM_FEATURES = list(weights.values())
+
+RLM_MODELS = [
+    "full",
+    "full_temp",
+    "short",
+    "short_full",
+    "short_full_temp",
+    "short_temp",
+]
+
+RLM_STATIONS = list(range(1, 201))
+
+RLM_BUNDLE = "data/models/rlm.npz"
+
+
+def rlm_path(station_id: int, model: str) -> str:
+    """The path of the weight file of a pre-trained model."""
+    return f"data/models/model_station_{station_id}_rlm_{model}.csv"
+
+
+def rlm_fingerprint(stations: list[int], models: list[str]) -> str:
+    """A fingerprint of the weight files: their paths, modification times and sizes."""
+    digest = sha1()
+    for station_id, model in product(stations, models):
+        path = rlm_path(station_id, model)
+        source = stat(path)
+        digest.update(f"{path}:{source.st_mtime_ns}:{source.st_size};".encode())
+    return digest.hexdigest()
+
+
+class RLMEngine:
+    """
+    The pre-trained RLM models, as one dense coefficient matrix.
+
+    Each row is a (station, model) pair, ordered by station and then model. The first
+    column is the intercept and the rest are the weights of `RLM_FEATURES`.
+    """
+
+    def __init__(
+        self,
+        stations: list[int],
+        models: list[str],
+        coef: NDArray[float64],
+        used: NDArray[bool_],
+    ):
+        self.stations = stations
+        self.models = models
+        self.coef = coef
+        self.used = used
+        self.index = {
+            (station_id, model): row
+            for row, (station_id, model) in enumerate(product(stations, models))
+        }
+
+        # The engine is shared, so make its arrays immutable.
+        self.coef.flags.writeable = False
+        self.used.flags.writeable = False
+
+    @classmethod
+    def read(
+        cls, stations: list[int] | None = None, models: list[str] | None = None
+    ) -> "RLMEngine":
+        """Read the weight files of the pre-trained models."""
+        stations = stations or RLM_STATIONS
+        models = models or RLM_MODELS
+
+        coef = zeros((len(stations) * len(models), 1 + len(RLM_FEATURES)))
+        used = zeros((len(stations) * len(models), len(RLM_FEATURES)), dtype=bool_)
+
+        for row, (station_id, model) in enumerate(product(stations, models)):
+            data = read_csv(rlm_path(station_id, model), header=0, names=columns)
+
+            for feature, weight in zip(data["feature"], data["weight"]):
+                if feature == intercept:
+                    coef[row, 0] = weight
+                elif feature in weights:
+                    column = RLM_FEATURES.index(weights[feature])
+                    coef[row, 1 + column] = weight
+                    used[row, column] = True
+
+        return cls(stations, models, coef, used)
+
+    def save(self, path: str, fingerprint: str) -> None:
+        """Save the engine to a binary bundle."""
+        temp = f"{path}.{getpid()}.tmp"
+        try:
+            with open(temp, "wb") as file:
+                savez(
+                    file,
+                    stations=array(self.stations),
+                    models=array(self.models),
+                    features=array(RLM_FEATURES),
+                    coef=self.coef,
+                    used=self.used,
+                    fingerprint=array(fingerprint),
+                )
+            replace(temp, path)
+        finally:
+            if exists(temp):
+                remove(temp)
+
+    @classmethod
+    def load(cls, path: str) -> tuple["RLMEngine", str]:
+        """Load the engine and the fingerprint of its sources from a binary bundle."""
+        with load(path, allow_pickle=False) as bundle:
+            if bundle["features"].tolist() != RLM_FEATURES:
+                raise ValueError("The bundle's features are out of date.")
+
+            return cls(
+                bundle["stations"].tolist(),
+                bundle["models"].tolist(),
+                bundle["coef"],
+                bundle["used"],
+            ), str(bundle["fingerprint"])
+
+    def rows(
+        self, station_ids: list[int] | None = None, models: list[str] | None = None
+    ) -> list[int]:
+        """The rows of the given stations and models, in station-then-model order."""
+        return [
+            self.index[(station_id, model)]
+            for station_id in station_ids or self.stations
+            for model in self.models
+            if model in (models or self.models)
+        ]
+
+    def predict(
+        self, x: DataFrame, rows: list[int] | None = None, dtype: Any = float64
+    ) -> NDArray[float64]:
+        """
+        Predict with every model in `rows`, as a (samples, models) matrix.
+
+        As for the individual models, a prediction is `nan` if any of the features
+        that its model uses is `nan`.
+        """
+        rows = list(range(len(self.coef))) if rows is None else rows
+
+        used = self.used[rows]
+        features = used.any(axis=0)
+        names = [name for name, use in zip(RLM_FEATURES, features) if use]
+
+        values = x[names].to_numpy(dtype)
+        nan = isnan(values)
+        coef = self.coef[rows].astype(dtype, copy=False)
+
+        y = where(nan, 0, values) @ coef[:, 1:][:, features].T + coef[:, 0]
+
+        samples = nan.any(axis=1)
+        if samples.any():
+            missing = (nan[samples].astype(dtype) @ used[:, features].T) > 0
+            y[samples] = where(missing, float("nan"), y[samples])
+
+        return y
+
+
+def build_rlm_bundle(path: str = RLM_BUNDLE) -> RLMEngine:
+    """Read the weight files of all pre-trained models and pack them into a bundle."""
+    engine = RLMEngine.read()
+    engine.save(path, rlm_fingerprint(engine.stations, engine.models))
+    return engine
+
+
+@lru_cache(maxsize=1)
+def get_rlm_engine() -> RLMEngine:
+    """
+    Get the process-wide engine of all pre-trained models.
+
+    The engine is loaded from the bundle if it is up to date with the weight files,
+    and the bundle is rebuilt otherwise (if it can be written, e.g., the data
+    directory is not read-only).
+    """
+    try:
+        engine, fingerprint = RLMEngine.load(RLM_BUNDLE)
+        if fingerprint == rlm_fingerprint(engine.stations, engine.models):
+            return engine
+    except (OSError, KeyError, ValueError):
+        pass
+
+    engine = RLMEngine.read()
+    try:
+        engine.save(RLM_BUNDLE, rlm_fingerprint(engine.stations, engine.models))
+    except OSError:
+        pass
+    return engine
+
 
 class ModelLoader(BaseEstimator, RegressorMixin):
-    """Abstract model-loader class."""
+    """
+    Abstract model-loader class: a view of one row of the RLM engine.
 
-    data: DataFrame
+    Model loaders are shared by the registry, so they are immutable.
+    """
 
-    def __init__(self, station_id: int):
-        self.station_id = station_id
+    model: str
 
-    def _get_weight(self, feature: str) -> float:
-        return self.data.loc[self.data["feature"] == feature, "weight"].item()
+    def __init__(self, station_id: int):
+        object.__setattr__(self, "station_id", station_id)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{self.__class__.__name__} is immutable.")
+
+    @property
+    def row(self) -> int:
+        """The row of the model in the RLM engine."""
+        return get_rlm_engine().index[(self.station_id, self.model)]
+
+    @property
+    def coef(self) -> dict[str, float]:
+        """The intercept and the weights of the features that the model uses."""
+        engine = get_rlm_engine()
+        coef, used = engine.coef[self.row], engine.used[self.row]
+        return {
+            "intercept": float(coef[0]),
+            **{
+                feature: float(weight)
+                for feature, weight, use in zip(RLM_FEATURES, coef[1:], used)
+                if use
+            },
+        }
 
     def fit(self, _x, _y):
         """No-op."""
@@ -36,159 +262,63 @@ class ModelLoader(BaseEstimator, RegressorMixin):
 
     def predict(self, x: DataFrame):
         """Predict."""
-        raise NotImplementedError
+        return get_rlm_engine().predict(x, [self.row])[:, 0]
 
 
 class ModelLoaderFull(ModelLoader):
     """`full` model-loader class."""
 
-    def __init__(self, station_id: int):
-        super().__init__(station_id)
-
-        path = f"data/models/model_station_{station_id}_rlm_full.csv"
-        self.data = read_csv(path, header=0, names=columns)
-
-        self.intercept = self._get_weight(intercept)
-        self.bikes_3h = self._get_weight(bikes_3h)
-        self.bikes_3h_diff_avg_full = self._get_weight(bikes_3h_diff_avg_full)
-        self.bikes_avg_full = self._get_weight(bikes_avg_full)
-
-    def predict(self, x):
-        return (
-            self.intercept
-            + self.bikes_3h * x["bikes_3h"]
-            + self.bikes_3h_diff_avg_full * x["bikes_3h_diff_avg_full"]
-            + self.bikes_avg_full * x["bikes_avg_full"]
-        ).to_numpy()
+    model = "full"
 
 
 class ModelLoaderFullTemp(ModelLoader):
     """`full_temp` model-loader class."""
 
-    def __init__(self, station_id: int):
-        super().__init__(station_id)
-
-        path = f"data/models/model_station_{station_id}_rlm_full_temp.csv"
-        self.data = read_csv(path, header=0, names=columns)
-
-        self.intercept = self._get_weight(intercept)
-        self.bikes_3h = self._get_weight(bikes_3h)
-        self.bikes_3h_diff_avg_full = self._get_weight(bikes_3h_diff_avg_full)
-        self.bikes_avg_full = self._get_weight(bikes_avg_full)
-        self.temperature = self._get_weight(temperature)
-
-    def predict(self, x):
-        return (
-            self.intercept
-            + self.bikes_3h * x["bikes_3h"]
-            + self.bikes_3h_diff_avg_full * x["bikes_3h_diff_avg_full"]
-            + self.bikes_avg_full * x["bikes_avg_full"]
-            + self.temperature * x["temperature"]
-        ).to_numpy()
+    model = "full_temp"
 
 
 class ModelLoaderShortFull(ModelLoader):
     """`short_full` model-loader class."""
 
-    def __init__(self, station_id: int):
-        super().__init__(station_id)
-
-        path = f"data/models/model_station_{station_id}_rlm_short_full.csv"
-        self.data = read_csv(path, header=0, names=columns)
-
-        self.intercept = self._get_weight(intercept)
-        self.bikes_3h = self._get_weight(bikes_3h)
-        self.bikes_3h_diff_avg_full = self._get_weight(bikes_3h_diff_avg_full)
-        self.bikes_3h_diff_avg_short = self._get_weight(bikes_3h_diff_avg_short)
-        self.bikes_avg_full = self._get_weight(bikes_avg_full)
-        self.bikes_avg_short = self._get_weight(bikes_avg_short)
-
-    def predict(self, x):
-        return (
-            self.intercept
-            + self.bikes_3h * x["bikes_3h"]
-            + self.bikes_3h_diff_avg_full * x["bikes_3h_diff_avg_full"]
-            + self.bikes_3h_diff_avg_short * x["bikes_3h_diff_avg_short"]
-            + self.bikes_avg_full * x["bikes_avg_full"]
-            + self.bikes_avg_short * x["bikes_avg_short"]
-        ).to_numpy()
+    model = "short_full"
 
 
 class ModelLoaderShort(ModelLoader):
     """`short` model-loader class."""
 
-    def __init__(self, station_id: int):
-        super().__init__(station_id)
-
-        path = f"data/models/model_station_{station_id}_rlm_short.csv"
-        self.data = read_csv(path, header=0, names=columns)
-
-        self.intercept = self._get_weight(intercept)
-        self.bikes_3h = self._get_weight(bikes_3h)
-        self.bikes_3h_diff_avg_short = self._get_weight(bikes_3h_diff_avg_short)
-        self.bikes_avg_short = self._get_weight(bikes_avg_short)
-
-    def predict(self, x):
-        return (
-            self.intercept
-            + self.bikes_3h * x["bikes_3h"]
-            + self.bikes_3h_diff_avg_short * x["bikes_3h_diff_avg_short"]
-            + self.bikes_avg_short * x["bikes_avg_short"]
-        ).to_numpy()
+    model = "short"
 
 
 class ModelLoaderShortFullTemp(ModelLoader):
     """`short_full_temp` model-loader class."""
 
-    def __init__(self, station_id: int):
-        super().__init__(station_id)
-
-        path = f"data/models/model_station_{station_id}_rlm_short_full_temp.csv"
-        self.data = read_csv(path, header=0, names=columns)
-
-        self.intercept = self._get_weight(intercept)
-        self.bikes_3h = self._get_weight(bikes_3h)
-        self.bikes_3h_diff_avg_full = self._get_weight(bikes_3h_diff_avg_full)
-        self.bikes_3h_diff_avg_short = self._get_weight(bikes_3h_diff_avg_short)
-        self.bikes_avg_full = self._get_weight(bikes_avg_full)
-        self.bikes_avg_short = self._get_weight(bikes_avg_short)
-        self.temperature = self._get_weight(temperature)
-
-    def predict(self, x):
-        return (
-            self.intercept
-            + self.bikes_3h * x["bikes_3h"]
-            + self.bikes_3h_diff_avg_full * x["bikes_3h_diff_avg_full"]
-            + self.bikes_3h_diff_avg_short * x["bikes_3h_diff_avg_short"]
-            + self.bikes_avg_full * x["bikes_avg_full"]
-            + self.bikes_avg_short * x["bikes_avg_short"]
-            + self.temperature * x["temperature"]
-        ).to_numpy()
+    model = "short_full_temp"
 
 
 class ModelLoaderShortTemp(ModelLoader):
     """`short_temp` model-loader class."""
 
-    def __init__(self, station_id: int):
-        super().__init__(station_id)
+    model = "short_temp"
+
 
-        path = f"data/models/model_station_{station_id}_rlm_short_temp.csv"
-        self.data = read_csv(path, header=0, names=columns)
+MODEL_LOADERS: dict[str, type[ModelLoader]] = {
+    "full": ModelLoaderFull,
+    "full_temp": ModelLoaderFullTemp,
+    "short": ModelLoaderShort,
+    "short_full": ModelLoaderShortFull,
+    "short_full_temp": ModelLoaderShortFullTemp,
+    "short_temp": ModelLoaderShortTemp,
+}
 
-        self.intercept = self._get_weight(intercept)
-        self.bikes_3h = self._get_weight(bikes_3h)
-        self.bikes_3h_diff_avg_short = self._get_weight(bikes_3h_diff_avg_short)
-        self.bikes_avg_short = self._get_weight(bikes_avg_short)
-        self.temperature = self._get_weight(temperature)
 
-    def predict(self, x):
-        return (
-            self.intercept
-            + self.bikes_3h * x["bikes_3h"]
-            + self.bikes_3h_diff_avg_short * x["bikes_3h_diff_avg_short"]
-            + self.bikes_avg_short * x["bikes_avg_short"]
-            + self.temperature * x["temperature"]
-        ).to_numpy()
+# The most estimators to keep in the registry: every pre-trained model.
+ESTIMATORS_MAX = len(RLM_STATIONS) * len(RLM_MODELS)
+
+
+@lru_cache(maxsize=ESTIMATORS_MAX)
+def get_estimator(station_id: int, model: str) -> ModelLoader:
+    """Get the shared estimator for a station and model."""
+    return MODEL_LOADERS[model](station_id)
 
 
 def get_station_estimator_ids(
@@ -196,72 +326,13 @@ def get_station_estimator_ids(
 ) -> list[tuple[str, int, ModelLoader]]:
     """Get all estimators and IDs for a station."""
 
-    models = models or [
-        "full",
-        "full_temp",
-        "short",
-        "short_full",
-        "short_full_temp",
-        "short_temp",
-    ]
-
-    estimators: list[tuple[str, int, ModelLoader]] = []
-
-    if "full" in models:
-        estimators.append(
-            (
-                f"full_{station_id}",
-                station_id,
-                ModelLoaderFull(station_id),
-            )
-        )
-
-    if "full_temp" in models:
-        estimators.append(
-            (
-                f"full_temp_{station_id}",
-                station_id,
-                ModelLoaderFullTemp(station_id),
-            )
-        )
+    models = models or RLM_MODELS
 
-    if "short" in models:
-        estimators.append(
-            (
-                f"short_{station_id}",
-                station_id,
-                ModelLoaderShort(station_id),
-            )
-        )
-
-    if "short_full" in models:
-        estimators.append(
-            (
-                f"short_full_{station_id}",
-                station_id,
-                ModelLoaderShortFull(station_id),
-            )
-        )
-
-    if "short_full_temp" in models:
-        estimators.append(
-            (
-                f"short_full_temp_{station_id}",
-                station_id,
-                ModelLoaderShortFullTemp(station_id),
-            )
-        )
-
-    if "short_temp" in models:
-        estimators.append(
-            (
-                f"short_temp_{station_id}",
-                station_id,
-                ModelLoaderShortTemp(station_id),
-            )
-        )
-
-    return estimators
+    return [
+        (f"{model}_{station_id}", station_id, get_estimator(station_id, model))
+        for model in RLM_MODELS
+        if model in models
+    ]
 
 
 def get_station_estimators(
@@ -269,89 +340,57 @@ def get_station_estimators(
 ) -> list[tuple[str, ModelLoader]]:
     """Get all estimators for a station."""
 
-    models = models or [
-        "full",
-        "full_temp",
-        "short",
-        "short_full",
-        "short_full_temp",
-        "short_temp",
-    ]
-
-    estimators: list[tuple[str, ModelLoader]] = []
-
-    if "full" in models:
-        estimators.append(
-            (
-                f"full_{station_id}",
-                ModelLoaderFull(station_id),
-            )
-        )
-
-    if "full_temp" in models:
-        estimators.append(
-            (
-                f"full_temp_{station_id}",
-                ModelLoaderFullTemp(station_id),
-            )
-        )
-
-    if "short" in models:
-        estimators.append(
-            (
-                f"short_{station_id}",
-                ModelLoaderShort(station_id),
-            )
+    return [
+        (name, estimator)
+        for name, _station_id, estimator in get_station_estimator_ids(
+            station_id, models
         )
+    ]
 
-    if "short_full" in models:
-        estimators.append(
-            (
-                f"short_full_{station_id}",
-                ModelLoaderShortFull(station_id),
-            )
-        )
 
-    if "short_full_temp" in models:
-        estimators.append(
-            (
-                f"short_full_temp_{station_id}",
-                ModelLoaderShortFullTemp(station_id),
-            )
-        )
+T = TypeVar("T")
 
-    if "short_temp" in models:
-        estimators.append(
-            (
-                f"short_temp_{station_id}",
-                ModelLoaderShortTemp(station_id),
-            )
-        )
 
-    return estimators
+def concat(list_of_lists: Iterable[list[T]]) -> list[T]:
+    """Concatenate a list of lists into a single list."""
+    return list(chain.from_iterable(list_of_lists))
 
 
-T = TypeVar("T")
+def _models_key(models: list[str] | None) -> tuple[str, ...] | str | None:
+    """A hashable key for a selection of models (which may also be a string)."""
+    if not models:
+        return None
+    return models if isinstance(models, str) else tuple(models)
 
 
-def concat(list_of_lists: list[list[T]]) -> list[T]:
-    """Concatenate a list of lists into a single list."""
-    return reduce(lambda x, y: x + y, list_of_lists)
+@lru_cache(maxsize=64)
+def _get_estimator_ids(
+    models: tuple[str, ...] | str | None
+) -> tuple[tuple[str, int, ModelLoader], ...]:
+    return tuple(
+        concat(
+            get_station_estimator_ids(station_id, models)  # type: ignore
+            for station_id in RLM_STATIONS
+        )
+    )
 
 
 def get_estimator_ids(
     models: list[str] | None = None,
 ) -> Sequence[tuple[str, int, ModelLoader]]:
     """Get all estimators and IDs."""
-    return concat(
-        [get_station_estimator_ids(station_id, models) for station_id in range(1, 201)]
-    )
+    return list(_get_estimator_ids(_models_key(models)))
 
 
 def get_estimators(
     models: list[str] | None = None,
 ) -> Sequence[tuple[str, ModelLoader]]:
     """Get all estimators."""
-    return concat(
-        [get_station_estimators(station_id, models) for station_id in range(1, 201)]
-    )
+    return [
+        (name, estimator)
+        for name, _station_id, estimator in _get_estimator_ids(_models_key(models))
+    ]
+
+
+if __name__ == "__main__":
+    build_rlm_bundle()
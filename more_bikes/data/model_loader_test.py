@@ -0,0 +1,93 @@
+"""Test the model-loader classes."""
+
+from numpy import array, nan
+from numpy.testing import assert_allclose
+from pandas import DataFrame
+from pytest import raises
+from sklearn.base import clone
+
+from . import model_loader
+from .model_loader import (
+    RLM_FEATURES,
+    RLM_STATIONS,
+    RLMEngine,
+    get_estimator,
+    get_estimator_ids,
+    get_estimators,
+)
+
+
+def test_rlm_engine_predict():
+    """Test that the engine predicts with every model, propagating `nan`."""
+
+    # Two models: `bikes_3h` only, and `bikes_3h` and `temperature`.
+    coef = array(
+        [[1.0, 2.0, 0.0, 0.0, 0.0, 0.0, 0.0], [0.5, 1.0, 0.0, 0.0, 0.0, 0.0, 3.0]]
+    )
+    used = coef[:, 1:] != 0
+
+    engine = RLMEngine([1], ["full", "full_temp"], coef, used)
+
+    x = DataFrame({feature: [0.0, 0.0] for feature in RLM_FEATURES})
+    x["bikes_3h"] = [1.0, 2.0]
+    x["temperature"] = [10.0, nan]
+    x["bikes_avg_short"] = nan
+
+    assert_allclose(engine.predict(x), [[3.0, 31.5], [5.0, nan]])
+    assert_allclose(
+        engine.predict(x, engine.rows(models=["full_temp"])), [[31.5], [nan]]
+    )
+
+
+def test_rlm_engine_read_only(tmp_path, monkeypatch):
+    """Test that the engine is built in memory if its bundle cannot be written."""
+
+    coef = array([[1.0, 2.0, 0.0, 0.0, 0.0, 0.0, 0.0]])
+    engine = RLMEngine([1], ["full"], coef, coef[:, 1:] != 0)
+
+    # The bundle's directory is a file, so neither it nor a temporary file is written.
+    (tmp_path / "models").write_text("")
+    monkeypatch.setattr(
+        model_loader, "RLM_BUNDLE", str(tmp_path / "models" / "rlm.npz")
+    )
+    monkeypatch.setattr(RLMEngine, "read", classmethod(lambda cls: engine))
+    monkeypatch.setattr(model_loader, "rlm_fingerprint", lambda *_: "fingerprint")
+
+    assert model_loader.get_rlm_engine.__wrapped__() is engine
+
+
+def test_get_estimators():
+    """Test that the registry selects models by a list or a string, as before."""
+
+    names = [name for name, _ in get_estimators(["short_temp", "full"])]
+    assert names[:2] == ["full_1", "short_temp_1"]
+    assert len(names) == 2 * len(RLM_STATIONS)
+
+    # A string selects the models whose names are in it (e.g., "full" and "short").
+    assert [name for name, _ in get_estimators("short_full")[:3]] == [  # type: ignore
+        "full_1",
+        "short_1",
+        "short_full_1",
+    ]
+
+    # The estimators are shared, and their IDs are those of their stations.
+    assert all(
+        estimator is get_estimator(station_id, estimator.model)
+        for _, station_id, estimator in get_estimator_ids(["full"])
+    )
+    assert get_estimators() == get_estimators(None)
+
+
+def test_model_loader_immutable():
+    """Test that the shared model loaders cannot be changed, but can be cloned."""
+
+    estimator = get_estimator(1, "full")
+
+    with raises(AttributeError):
+        estimator.station_id = 2
+    with raises(AttributeError):
+        estimator.set_params(station_id=2)
+    assert estimator.station_id == 1
+
+    cloned = clone(estimator)
+    assert cloned is not estimator and cloned.station_id == 1
@@ -0,0 +1,55 @@
+"""Fitted models saved by experiments, to predict again without fitting."""
+
+from dataclasses import dataclass
+from os import getpid, replace
+from typing import Any
+
+from joblib import dump, load
+
+
+@dataclass
+class Artifact:
+    """A fitted model and its cross-validation results."""
+
+    # The fitted estimator (e.g., the best estimator of a search).
+    estimator: Any
+
+    # The score of the estimator, as the negative MAE.
+    score: float
+
+    # The MAE of each split.
+    scores: list[float]
+
+    # The results of the search, if any.
+    cv_results: dict[str, Any] | None
+
+    # A fingerprint of the training data, model and parameters.
+    fingerprint: str
+
+
+def artifact_path(output_path: str, name: str, key: str | None = None) -> str:
+    """The path of the artifact of an experiment (and, e.g., a station)."""
+    return (
+        f"{output_path}/{name}.joblib"
+        if key is None
+        else f"{output_path}/{name}_{key}.joblib"
+    )
+
+
+def save_artifact(path: str, artifact: Artifact) -> None:
+    """Save an artifact."""
+    temp = f"{path}.{getpid()}.tmp"
+    dump(artifact, temp)
+    replace(temp, path)
+
+
+def load_artifact(path: str, fingerprint: str) -> Artifact:
+    """Load an artifact, if it is up to date with the fingerprint."""
+    artifact = load(path)
+
+    if not isinstance(artifact, Artifact):
+        raise ValueError(f"{path} is not an artifact.")
+    if artifact.fingerprint != fingerprint:
+        raise ValueError(f"{path} is out of date: run the experiment again.")
+
+    return artifact
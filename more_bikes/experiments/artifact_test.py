@@ -0,0 +1,23 @@
+"""Test the saved models."""
+
+from numpy.testing import assert_allclose
+from pytest import raises
+from sklearn.linear_model import LinearRegression
+
+from .artifact import Artifact, artifact_path, load_artifact, save_artifact
+
+
+def test_artifact(tmp_path):
+    """Test that an artifact loads only if it is up to date."""
+
+    estimator = LinearRegression().fit([[0.0], [1.0], [2.0]], [1.0, 3.0, 5.0])
+    path = artifact_path(str(tmp_path), "linear", "201")
+
+    save_artifact(path, Artifact(estimator, -0.5, [0.4, 0.6], None, "abc"))
+
+    artifact = load_artifact(path, "abc")
+    assert artifact.scores == [0.4, 0.6]
+    assert_allclose(artifact.estimator.predict([[3.0]]), [7.0])
+
+    with raises(ValueError):
+        load_artifact(path, "def")
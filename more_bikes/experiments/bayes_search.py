@@ -0,0 +1,310 @@
+"""A search of a parameter grid by a tree-structured Parzen estimator."""
+
+# pylint: disable=attribute-defined-outside-init
+
+from itertools import product
+from math import ceil, isnan, prod
+from time import time
+from traceback import format_exc
+from typing import Any, Iterator
+from warnings import warn
+
+from numpy import array, full, inf, log, nan
+from numpy.random import Generator, default_rng
+from pandas import DataFrame, Series
+from sklearn.base import BaseEstimator, clone
+from sklearn.exceptions import FitFailedWarning
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import BaseCrossValidator, cross_validate
+from sklearn.utils.parallel import Parallel, delayed
+
+from more_bikes.experiments.params.util import ParamGrid
+from more_bikes.experiments.staged_search import _format_results
+
+# A trial: the index of its grid and the index of the value of each of its parameters.
+Trial = tuple[int, tuple[int, ...]]
+
+
+def _evaluate(
+    trial: Trial,
+    estimator: Any,
+    params: dict[str, Any],
+    scorer: Any,
+    x: DataFrame,
+    y: Series,
+    cv: BaseCrossValidator,
+    error_score: Any,
+) -> tuple[Trial, dict[str, Any]]:
+    """
+    Cross-validate a clone of an estimator with the parameters of a trial.
+
+    A failed fit scores `error_score`, as in `cross_validate`, and so does every fold
+    if every fit fails (where `cross_validate` raises), unless it is "raise".
+    """
+    try:
+        return trial, cross_validate(
+            clone(estimator).set_params(**params),
+            x,
+            y,
+            cv=cv,
+            scoring=scorer,
+            error_score=error_score,
+        )
+    except Exception:  # pylint: disable=broad-exception-caught
+        if error_score == "raise":
+            raise
+        warn(
+            f"Every fit of {params} failed. Its score is {error_score}:\n"
+            f"{format_exc()}",
+            FitFailedWarning,
+        )
+        n_splits = cv.get_n_splits(x, y)
+        return trial, {
+            "test_score": full(n_splits, error_score, dtype=float),
+            "fit_time": full(n_splits, 0.0),
+            "score_time": full(n_splits, 0.0),
+        }
+
+
+class TPESearchCV(BaseEstimator):
+    """
+    A search of a parameter grid that proposes each candidate from the scores so far.
+
+    After `n_startup` random candidates, each candidate is the one of `n_candidates`
+    samples from the values of the best `gamma` of the candidates so far that is the
+    most likely to be among them rather than the rest (a tree-structured Parzen
+    estimator over the values of each parameter). The candidates whose fits failed
+    rank last.
+
+    The candidates are evaluated by `n_jobs` workers of the active `joblib` backend,
+    which proposes new ones as workers free up (up to `pre_dispatch` ahead), and so
+    must return their results as they complete (e.g., "loky" or "threading", not
+    "multiprocessing").
+
+    The search stops after `n_trials` candidates, or starts no more after `timeout`
+    seconds, and has the same results as `GridSearchCV` for the candidates it tried.
+    """
+
+    def __init__(
+        self,
+        estimator: Any,
+        param_grid: ParamGrid,
+        scoring: Any = None,
+        cv: BaseCrossValidator | None = None,
+        n_trials: int = 50,
+        timeout: float | None = None,
+        n_jobs: int | None = None,
+        pre_dispatch: int | str = "2*n_jobs",
+        n_startup: int = 10,
+        n_candidates: int = 24,
+        gamma: float = 0.25,
+        random_state: int | None = None,
+        verbose: int = 0,
+        error_score: Any = nan,
+    ):
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.scoring = scoring
+        self.cv = cv
+        self.n_trials = n_trials
+        self.timeout = timeout
+        self.n_jobs = n_jobs
+        self.pre_dispatch = pre_dispatch
+        self.n_startup = n_startup
+        self.n_candidates = n_candidates
+        self.gamma = gamma
+        self.random_state = random_state
+        self.verbose = verbose
+        self.error_score = error_score
+
+    def _grids(self) -> list[dict[str, list[Any]]]:
+        grids = (
+            self.param_grid if isinstance(self.param_grid, list) else [self.param_grid]
+        )
+        return [
+            {param: list(values) for param, values in grid.items()} for grid in grids
+        ]
+
+    def _params(self, trial: Trial) -> dict[str, Any]:
+        grid_index, indices = trial
+        grid = self._grids()[grid_index]
+        return {
+            param: values[index]
+            for (param, values), index in zip(sorted(grid.items()), indices)
+        }
+
+    def _sample(
+        self, rng: Generator, grid_index: int | None, weights: Any = None
+    ) -> Trial:
+        """Sample a trial, uniformly or by the weights of the values of each grid."""
+        grids = self._grids()
+        if grid_index is None:
+            sizes = array([prod(map(len, grid.values())) for grid in grids])
+            grid_index = int(rng.choice(len(grids), p=sizes / sizes.sum()))
+
+        values = sorted(grids[grid_index].items())
+        return grid_index, tuple(
+            int(
+                rng.choice(
+                    len(param_values),
+                    p=None if weights is None else weights[grid_index][param],
+                )
+            )
+            for param, param_values in values
+        )
+
+    def _densities(self, trials: list[Trial], grid_index: int) -> dict[str, Any]:
+        """The smoothed frequency of each value of each parameter of a grid."""
+        densities: dict[str, Any] = {}
+        for position, (param, values) in enumerate(
+            sorted(self._grids()[grid_index].items())
+        ):
+            counts = array([1.0] * len(values))
+            for trial_grid_index, indices in trials:
+                if trial_grid_index == grid_index:
+                    counts[indices[position]] += 1
+            densities[param] = counts / counts.sum()
+        return densities
+
+    def _propose(
+        self, rng: Generator, scored: list[tuple[Trial, float]], tried: set[Trial]
+    ) -> Trial | None:
+        """Propose a trial that has not been tried, or None if there are none left."""
+        size = sum(prod(map(len, grid.values())) for grid in self._grids())
+        if len(tried) >= size:
+            return None
+
+        if len(scored) < self.n_startup:
+            return self._propose_any(rng, tried)
+
+        # Rank the trials whose fits failed last.
+        ranked = [
+            trial
+            for trial, score in sorted(
+                scored, key=lambda item: inf if isnan(item[1]) else -item[1]
+            )
+        ]
+        n_good = max(1, ceil(self.gamma * len(ranked)))
+        good, bad = ranked[:n_good], ranked[n_good:]
+
+        grids = range(len(self._grids()))
+        goods = [self._densities(good, grid_index) for grid_index in grids]
+        bads = [self._densities(bad, grid_index) for grid_index in grids]
+
+        # Sample from the grids of the good trials, then their values.
+        good_grids = array([1.0 + sum(g == i for g, _ in good) for i in grids])
+        bad_grids = array([1.0 + sum(g == i for g, _ in bad) for i in grids])
+        good_grids, bad_grids = (
+            good_grids / good_grids.sum(),
+            bad_grids / bad_grids.sum(),
+        )
+
+        best: tuple[float, Trial] | None = None
+        for _ in range(self.n_candidates):
+            grid_index = int(rng.choice(len(good_grids), p=good_grids))
+            trial = self._sample(rng, grid_index, goods)
+            if trial in tried:
+                continue
+
+            _, indices = trial
+            params = sorted(self._grids()[grid_index])
+            score = log(good_grids[grid_index] / bad_grids[grid_index]) + sum(
+                log(goods[grid_index][param][index] / bads[grid_index][param][index])
+                for param, index in zip(params, indices)
+            )
+            if best is None or score > best[0]:
+                best = (score, trial)
+
+        return best[1] if best is not None else self._propose_any(rng, tried)
+
+    def _propose_any(self, rng: Generator, tried: set[Trial]) -> Trial | None:
+        """Propose an untried trial uniformly at random."""
+        for _ in range(self.n_candidates):
+            trial = self._sample(rng, None)
+            if trial not in tried:
+                return trial
+
+        # Most of the grid has been tried: choose from the rest.
+        untried = [
+            (grid_index, indices)
+            for grid_index, grid in enumerate(self._grids())
+            for indices in product(
+                *(range(len(values)) for _, values in sorted(grid.items()))
+            )
+            if (grid_index, indices) not in tried
+        ]
+        return untried[rng.integers(len(untried))] if untried else None
+
+    def fit(self, X: DataFrame, y: Series):
+        """Search the grid and refit the best candidate on all the data."""
+        assert self.cv is not None
+        start = time()
+        rng = default_rng(self.random_state)
+        scorer = check_scoring(self.estimator, self.scoring)
+
+        scored: list[tuple[Trial, float]] = []
+        results: list[tuple[Trial, dict[str, Any]]] = []
+        tried: set[Trial] = set()
+
+        def trials() -> Iterator[Any]:
+            """Propose trials while the budget lasts, as `joblib` dispatches them."""
+            # Try at least one candidate, so that there is a best one.
+            while len(tried) < self.n_trials and (
+                not tried or self.timeout is None or time() - start < self.timeout
+            ):
+                trial = self._propose(rng, list(scored), tried)
+                if trial is None:
+                    return
+                tried.add(trial)
+                yield delayed(_evaluate)(
+                    trial,
+                    self.estimator,
+                    self._params(trial),
+                    scorer,
+                    X,
+                    y,
+                    self.cv,
+                    self.error_score,
+                )
+
+        for trial, result in Parallel(
+            n_jobs=self.n_jobs,
+            pre_dispatch=self.pre_dispatch,
+            batch_size=1,
+            return_as="generator_unordered",
+        )(trials()):
+            score = float(result["test_score"].mean())
+            scored.append((trial, score))
+            results.append((trial, result))
+
+            if self.verbose > 1:
+                print(
+                    f"[TPE {len(results)}/{self.n_trials}] END "
+                    f"{self._params(trial)}; score={score:.3f}"
+                )
+
+        if all(isnan(score) for _, score in scored):
+            raise ValueError(f"The fits of all the {len(scored)} candidates failed.")
+
+        candidates = [self._params(trial) for trial, _ in results]
+        self.cv_results_ = _format_results(
+            candidates,
+            array([result["test_score"] for _, result in results]),
+            array([result["fit_time"] for _, result in results]),
+            array([result["score_time"] for _, result in results]),
+        )
+        self.n_splits_ = self.cv.get_n_splits(X, y)
+        self.best_index_ = int(self.cv_results_["rank_test_score"].argmin())
+        self.best_score_ = float(self.cv_results_["mean_test_score"][self.best_index_])
+        self.best_params_ = candidates[self.best_index_]
+
+        refit_start = time()
+        self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_)
+        self.best_estimator_.fit(X, y)
+        self.refit_time_ = time() - refit_start
+
+        return self
+
+    def predict(self, X: DataFrame):
+        """Predict with the best estimator."""
+        return self.best_estimator_.predict(X)
@@ -0,0 +1,98 @@
+"""Test the tree-structured Parzen estimator search."""
+
+from warnings import catch_warnings
+
+from joblib import parallel_backend
+from lightgbm import LGBMRegressor
+from numpy import arange, isnan
+from numpy.random import default_rng
+from numpy.testing import assert_allclose
+from pandas import DataFrame
+from pytest import raises
+from sklearn.exceptions import FitFailedWarning
+from sklearn.model_selection import GridSearchCV, TimeSeriesSplit
+
+from .bayes_search import TPESearchCV
+
+
+def test_tpe_search():
+    """Test that the search tries unique candidates within its budget, as scored."""
+
+    rng = default_rng(42)
+    x = DataFrame(rng.normal(size=(300, 3)), columns=["a", "b", "c"])
+    y = x["a"] * (1 + arange(300) % 5) + rng.normal(size=300) / 10
+    cv = TimeSeriesSplit(n_splits=3)
+
+    estimator = LGBMRegressor(random_state=42, verbose=-1)
+    param_grid = [
+        {"learning_rate": [0.03, 0.1, 0.3], "n_estimators": [5, 10, 20]},
+        {"boosting_type": ["dart"], "n_estimators": [5, 10]},
+    ]
+
+    expected = GridSearchCV(
+        estimator, param_grid, scoring="neg_mean_absolute_error", cv=cv
+    ).fit(x, y)
+    scores = dict(
+        zip(
+            map(repr, expected.cv_results_["params"]),
+            expected.cv_results_["mean_test_score"],
+        )
+    )
+
+    for n_trials, n_jobs in [(6, 1), (6, 2), (11, 2)]:
+        with parallel_backend("threading"):
+            actual = TPESearchCV(
+                estimator,
+                param_grid,
+                scoring="neg_mean_absolute_error",
+                cv=cv,
+                n_trials=n_trials,
+                n_jobs=n_jobs,
+                n_startup=3,
+                random_state=42,
+            ).fit(x, y)
+
+        candidates = list(map(repr, actual.cv_results_["params"]))
+        assert len(candidates) == n_trials
+        assert len(set(candidates)) == n_trials
+        assert_allclose(
+            actual.cv_results_["mean_test_score"],
+            [scores[candidate] for candidate in candidates],
+        )
+
+    # With a budget of the whole grid, the search finds the best candidate.
+    assert actual.best_params_ == expected.best_params_
+    assert_allclose(actual.predict(x), expected.predict(x))
+
+
+def test_tpe_search_failures():
+    """Test that the candidates whose fits fail score `nan` and rank last."""
+
+    rng = default_rng(42)
+    x = DataFrame(rng.normal(size=(200, 2)), columns=["a", "b"])
+    y = x["a"] + rng.normal(size=200) / 10
+    cv = TimeSeriesSplit(n_splits=3)
+
+    # A single leaf is not a tree: every fit fails.
+    search = TPESearchCV(
+        LGBMRegressor(n_estimators=10, random_state=42, verbose=-1),
+        {"num_leaves": [1, 3, 7], "learning_rate": [0.1, 0.3]},
+        scoring="neg_mean_absolute_error",
+        cv=cv,
+        n_trials=6,
+        n_startup=2,
+        random_state=42,
+    )
+    with catch_warnings(record=True) as warnings:
+        actual = search.fit(x, y)
+
+    failed = [params["num_leaves"] == 1 for params in actual.cv_results_["params"]]
+    assert list(isnan(actual.cv_results_["mean_test_score"])) == failed
+    assert sorted(actual.cv_results_["rank_test_score"][failed]) == [5, 5]
+    assert any(warning.category is FitFailedWarning for warning in warnings)
+    assert actual.best_params_["num_leaves"] != 1
+
+    # A backend that cannot return results as they complete.
+    with raises(ValueError):
+        with parallel_backend("multiprocessing"):
+            search.set_params(n_jobs=2).fit(x, y)
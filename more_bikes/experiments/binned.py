@@ -0,0 +1,157 @@
+"""Gradient-boosted models that bin each training set once across search candidates."""
+
+# pylint: disable=attribute-defined-outside-init
+
+from typing import Any, Self
+
+from lightgbm import Booster, Dataset, LGBMRegressor, train
+from numpy import ascontiguousarray
+from sklearn.base import clone
+from sklearn.ensemble import HistGradientBoostingRegressor
+
+from more_bikes.util.memory import MemoryCache
+
+# The parameters of `LGBMRegressor` that change the bins of its `Dataset`.
+LGBM_DATASET_PARAMS = [
+    "max_bin",
+    "min_child_samples",
+    "min_data_in_bin",
+    "random_state",
+    "subsample_for_bin",
+]
+
+# The parameters of `LGBMRegressor` that are not LightGBM parameters (or aliases).
+LGBM_SKLEARN_PARAMS = ["class_weight", "importance_type", "n_estimators"]
+
+
+class BinsCache(MemoryCache):
+    """
+    The binned training and validation sets of the folds of one search.
+
+    The search only varies parameters that do not change the bins, so every candidate
+    reuses them. Like any `MemoryCache`, the candidates in a worker process share that
+    worker's cache of the search.
+    """
+
+    def __init__(self, maxsize: int = 32, key: str | None = None) -> None:
+        super().__init__(maxsize, key)
+
+
+def with_bins(estimator: Any, bins: BinsCache | None) -> Any:
+    """A clone of the estimator whose binned regressors cache their bins in `bins`."""
+    estimator = clone(estimator)
+    for value in [estimator, *estimator.get_params(deep=True).values()]:
+        if isinstance(value, (BinnedHGBRegressor, BinnedLGBMRegressor)):
+            value.bins = bins
+    return estimator
+
+
+def _fit_bins(bin_mapper: Any, X: Any) -> tuple[Any, Any]:
+    return bin_mapper, bin_mapper.fit_transform(X)
+
+
+def _transform_bins(bin_mapper: Any, X: Any) -> Any:
+    return ascontiguousarray(bin_mapper.transform(X))
+
+
+def _dataset(X: Any, y: Any, params: dict[str, Any]) -> Dataset:
+    # The cached `Dataset` is only trained on with the same bins, so it needs no raw
+    # data.
+    return Dataset(X, y, params=params).construct()
+
+
+class BinnedHGBRegressor(HistGradientBoostingRegressor):
+    """
+    A `HistGradientBoostingRegressor` that caches its binned data in `bins`.
+
+    The bin mapper and binned matrix of a training set are cached by the data and
+    the parameters of the bin mapper, so the candidates of a search bin each fold
+    once, rather than once each. Without `bins` (see `with_bins`), it bins as usual.
+    """
+
+    bins: BinsCache | None = None
+
+    def __sklearn_clone__(self) -> Self:
+        clone_ = super().__sklearn_clone__()
+        clone_.bins = self.bins
+        return clone_
+
+    def _bin_data(self, X, is_training_data):
+        if self.bins is None:
+            return super()._bin_data(X, is_training_data)
+        if is_training_data:
+            self._bin_mapper, X_binned = self.bins.cache(_fit_bins)(self._bin_mapper, X)
+            return X_binned
+        return self.bins.cache(_transform_bins)(self._bin_mapper, X)
+
+
+class BinnedLGBMRegressor(LGBMRegressor):
+    """
+    An `LGBMRegressor` that caches the constructed `Dataset` of its training sets.
+
+    The `Dataset` of a training set is cached in `bins` by the data and the parameters
+    that change its bins, so the candidates of a search construct each fold once.
+
+    It trains on the `Dataset` by `lightgbm.train`, with its parameters by their
+    LightGBM aliases, and predicts by the trained `Booster` (its `booster_`): it sets
+    no other fitted attributes. Without `bins` (see `with_bins`), or with any other
+    arguments to `fit` (e.g., an `init_model`), it fits as an `LGBMRegressor`.
+    """
+
+    bins: BinsCache | None = None
+
+    def __sklearn_clone__(self) -> Self:
+        clone_ = super().__sklearn_clone__()
+        clone_.bins = self.bins
+        return clone_
+
+    def __sklearn_is_fitted__(self) -> bool:
+        return hasattr(self, "binned_booster_") or super().__sklearn_is_fitted__()
+
+    @property
+    def booster_(self) -> Booster:
+        """The trained `Booster`."""
+        if hasattr(self, "binned_booster_"):
+            return self.binned_booster_
+        return super().booster_
+
+    @property
+    def n_features_in_(self) -> int:
+        """The number of features of the training data."""
+        if hasattr(self, "binned_booster_"):
+            return self.binned_booster_.num_feature()
+        return super().n_features_in_
+
+    def fit(self, X, y, **kwargs):
+        if hasattr(self, "binned_booster_"):
+            del self.binned_booster_
+        if self.bins is None or kwargs:
+            return super().fit(X, y, **kwargs)
+
+        params = {
+            param: value
+            for param, value in self.get_params().items()
+            if value is not None and param not in LGBM_SKLEARN_PARAMS
+        }
+        params["objective"] = params.get("objective", "regression")
+
+        train_set = self.bins.cache(_dataset)(
+            X,
+            y,
+            {
+                param: value
+                for param, value in params.items()
+                if param in LGBM_DATASET_PARAMS
+            },
+        )
+
+        self.binned_booster_ = train(
+            params, train_set, num_boost_round=self.n_estimators
+        )
+        self.binned_booster_.free_dataset()
+        return self
+
+    def predict(self, X, num_iteration=None, **kwargs):
+        if not hasattr(self, "binned_booster_"):
+            return super().predict(X, num_iteration=num_iteration, **kwargs)
+        return self.binned_booster_.predict(X, num_iteration=num_iteration, **kwargs)
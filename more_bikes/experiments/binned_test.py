@@ -0,0 +1,83 @@
+"""Test the gradient-boosted models with cached bins."""
+
+from pickle import dumps, loads
+
+from lightgbm import LGBMRegressor
+from numpy.random import default_rng
+from numpy.testing import assert_allclose
+from pandas import DataFrame
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.model_selection import GridSearchCV, TimeSeriesSplit
+
+from .binned import BinnedHGBRegressor, BinnedLGBMRegressor, BinsCache, with_bins
+
+
+def test_binned():
+    """Test that a search bins each fold once and scores as without the cache."""
+
+    rng = default_rng(42)
+    x = DataFrame(rng.normal(size=(400, 3)), columns=["a", "b", "c"])
+    y = 2 * x["a"] - x["b"] + rng.normal(size=400)
+    cv = TimeSeriesSplit(n_splits=3)
+
+    for estimator, cached, params in [
+        (
+            HistGradientBoostingRegressor(max_iter=20, random_state=42),
+            BinnedHGBRegressor(max_iter=20, random_state=42),
+            {"learning_rate": [0.1, 0.2], "l2_regularization": [0.0, 0.5]},
+        ),
+        (
+            LGBMRegressor(n_estimators=20, random_state=42, verbose=-1),
+            BinnedLGBMRegressor(n_estimators=20, random_state=42, verbose=-1),
+            {"learning_rate": [0.1, 0.2], "num_leaves": [7, 15]},
+        ),
+    ]:
+        bins = BinsCache()
+        expected = GridSearchCV(estimator, params, cv=cv).fit(x, y)
+        actual = GridSearchCV(with_bins(cached, bins), params, cv=cv).fit(x, y)
+
+        assert_allclose(
+            actual.cv_results_["mean_test_score"],
+            expected.cv_results_["mean_test_score"],
+        )
+        assert_allclose(actual.predict(x), expected.predict(x))
+        assert actual.best_estimator_.n_features_in_ == 3
+
+        # One for each of three folds and the refit.
+        assert len(bins) == 3 + 1
+
+
+def test_binned_lgbm_booster():
+    """Test that the booster of a cached fit is that of an `LGBMRegressor`."""
+
+    rng = default_rng(42)
+    x = DataFrame(rng.normal(size=(200, 3)), columns=["a", "b", "c"])
+    y = x["a"] + rng.normal(size=200)
+
+    expected = LGBMRegressor(n_estimators=10, random_state=42, verbose=-1).fit(x, y)
+    actual = with_bins(
+        BinnedLGBMRegressor(n_estimators=10, random_state=42, verbose=-1), BinsCache()
+    ).fit(x, y)
+
+    assert actual.__sklearn_is_fitted__()
+    assert actual.booster_.current_iteration() == 10
+    assert actual.booster_.feature_name() == expected.booster_.feature_name()
+    assert_allclose(
+        actual.predict(x, num_iteration=5), expected.predict(x, num_iteration=5)
+    )
+
+
+def test_bins_cache():
+    """Test that a process keeps the cache of its latest search only."""
+
+    bins = BinsCache()
+    unpickled = loads(dumps(bins))
+    assert unpickled is not bins
+    assert loads(dumps(bins)) is unpickled
+
+    unpickled.cache(len)([1, 2])
+    assert len(unpickled) == 1
+
+    loads(dumps(BinsCache()))
+    assert len(unpickled) == 0
+    assert loads(dumps(bins)) is not unpickled
@@ -0,0 +1,170 @@
+"""Checkpoints of the (candidate, fold) scores of searches, to resume them."""
+
+from json import dumps, loads
+from os.path import exists
+from time import time
+from typing import Any, Callable
+
+from joblib import Memory
+from joblib import hash as hash_
+from sklearn.base import BaseEstimator
+
+from more_bikes.util.memory import MemoryCache, fingerprint
+
+
+def checkpoint_path(output_path: str, name: str, key: str | None = None) -> str:
+    """The path of the checkpoints of an experiment (and, e.g., a station)."""
+    return (
+        f"{output_path}/{name}_checkpoint.jsonl"
+        if key is None
+        else f"{output_path}/{name}_{key}_checkpoint.jsonl"
+    )
+
+
+def _params_key(value: Any) -> Any:
+    """
+    A stand-in for an estimator by its type and parameters, recursively, to hash it
+    the same way across runs. Caches (e.g., a pipeline's `memory`) do not change what
+    is fitted, but a `MemoryCache` has a new key each run, so they are left out.
+    """
+    if isinstance(value, (MemoryCache, Memory)):
+        return None
+    if isinstance(value, BaseEstimator):
+        return (
+            f"{type(value).__module__}.{type(value).__qualname__}",
+            {
+                name: _params_key(param)
+                for name, param in value.get_params(deep=False).items()
+            },
+        )
+    if isinstance(value, (list, tuple)):
+        return [_params_key(item) for item in value]
+    if isinstance(value, dict):
+        return {name: _params_key(item) for name, item in value.items()}
+    return value
+
+
+class CheckpointStore:
+    """
+    An append-only store of scores, keyed by what was fitted and what was scored.
+
+    Each score is appended as a line of JSON as soon as it is computed, so a search
+    that dies loses at most the folds that were running. Clones of an estimator share
+    the store, but it pickles as its path, so each worker process reads it again.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._scores: dict[tuple[str, str], tuple[float, float]] | None = None
+        self._fits: set[str] = set()
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (CheckpointStore, (self.path,))
+
+    def __deepcopy__(self, _memo: dict[int, Any]) -> "CheckpointStore":
+        return self
+
+    @property
+    def scores(self) -> dict[tuple[str, str], tuple[float, float]]:
+        """The score and fit time of each (fit, evaluation) pair."""
+        if self._scores is None:
+            self._scores = {}
+            if exists(self.path):
+                with open(self.path, encoding="utf-8") as file:
+                    for line in file:
+                        # Skip a line that was cut short, e.g., by a killed process.
+                        try:
+                            record = loads(line)
+                        except ValueError:
+                            continue
+                        self._scores[(record["fit"], record["eval"])] = (
+                            record["score"],
+                            record["fit_time"],
+                        )
+                        self._fits.add(record["fit"])
+        return self._scores
+
+    def fitted(self, fit: str) -> bool:
+        """Whether any score of a fit is in the store."""
+        return bool(self.scores) and fit in self._fits
+
+    def append(self, fit: str, eval_: str, score: float, fit_time: float) -> None:
+        """Append a score to the store."""
+        self.scores[(fit, eval_)] = (score, fit_time)
+        self._fits.add(fit)
+
+        line = dumps({"fit": fit, "eval": eval_, "score": score, "fit_time": fit_time})
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(f"{line}\n")
+
+
+class Checkpointed(BaseEstimator):
+    """
+    A wrapper that skips fitting an estimator if the store already has its scores.
+
+    The wrapper passes the parameters of the estimator through unprefixed, so it can
+    be searched with the same grid. If a score turns out to be missing after all, the
+    estimator is fitted when it is needed.
+    """
+
+    def __init__(self, estimator: Any, store: CheckpointStore):
+        self.estimator = estimator
+        self.store = store
+
+    def get_params(self, deep=True):
+        if not deep:
+            return {"estimator": self.estimator, "store": self.store}
+        return self.estimator.get_params(deep=True)
+
+    def set_params(self, **params):
+        self.estimator.set_params(**params)
+        return self
+
+    def fit(self, X, y):
+        """Fit the estimator, unless the store already has its scores."""
+        self.fit_key_ = hash_(
+            (_params_key(self.estimator), fingerprint(X), fingerprint(y))
+        )
+        self.fit_time_ = 0.0
+
+        self._pending: tuple[Any, Any] | None = None
+        if self.store.fitted(self.fit_key_):
+            self._pending = (X, y)
+        else:
+            self._fit(X, y)
+
+        return self
+
+    def _fit(self, X, y) -> None:
+        start = time()
+        self.estimator.fit(X, y)
+        self.fit_time_ = time() - start
+
+    def fit_pending(self) -> Any:
+        """Fit the estimator if its fit was skipped."""
+        if self._pending is not None:
+            self._fit(*self._pending)
+            self._pending = None
+        return self.estimator
+
+    def predict(self, X):
+        """Predict."""
+        return self.fit_pending().predict(X)
+
+
+class CheckpointScorer:
+    """A scorer that reads the scores of `Checkpointed` estimators from the store."""
+
+    def __init__(self, scorer: Callable[..., float], store: CheckpointStore):
+        self.scorer = scorer
+        self.store = store
+
+    def __call__(self, estimator: Checkpointed, X, y) -> float:
+        eval_ = hash_((fingerprint(X), fingerprint(y), repr(self.scorer)))
+
+        if (estimator.fit_key_, eval_) in self.store.scores:
+            return self.store.scores[(estimator.fit_key_, eval_)][0]
+
+        score = float(self.scorer(estimator.fit_pending(), X, y))
+        self.store.append(estimator.fit_key_, eval_, score, estimator.fit_time_)
+        return score
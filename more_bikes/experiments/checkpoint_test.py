@@ -0,0 +1,96 @@
+"""Test the checkpoints of searches."""
+
+from numpy import arange
+from numpy.testing import assert_allclose
+from pandas import DataFrame, Series
+from sklearn.linear_model import Ridge
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import GridSearchCV, TimeSeriesSplit
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from more_bikes.util.memory import MemoryCache
+
+from .binned import BinnedHGBRegressor, BinsCache, with_bins
+from .checkpoint import Checkpointed, CheckpointScorer, CheckpointStore
+
+
+class RidgeCount(Ridge):
+    """A ridge regressor that counts its fits."""
+
+    fits = 0
+
+    def fit(self, X, y, sample_weight=None):
+        RidgeCount.fits += 1
+        return super().fit(X, y, sample_weight)
+
+
+class BinnedHGBCount(BinnedHGBRegressor):
+    """A binned HGB regressor that counts its fits."""
+
+    fits = 0
+
+    def fit(self, X, y, sample_weight=None):
+        BinnedHGBCount.fits += 1
+        return super().fit(X, y, sample_weight)
+
+
+def test_checkpoint(tmp_path):
+    """Test that a resumed search skips the (candidate, fold) pairs in the store."""
+
+    x = DataFrame({"a": arange(60.0), "b": arange(60.0) % 7})
+    y = Series(2 * x["a"] - x["b"] + arange(60.0) % 3)
+    path = str(tmp_path / "checkpoint.jsonl")
+
+    def search() -> GridSearchCV:
+        store = CheckpointStore(path)
+        return GridSearchCV(
+            Checkpointed(RidgeCount(), store),
+            {"alpha": [0.1, 1.0, 10.0]},
+            scoring=CheckpointScorer(get_scorer("neg_mean_absolute_error"), store),
+            cv=TimeSeriesSplit(n_splits=4),
+        ).fit(x, y)
+
+    first = search()
+    assert RidgeCount.fits == 3 * 4 + 1
+    assert len(CheckpointStore(path).scores) == 3 * 4
+
+    # Only the refit on all the data is not in the store.
+    second = search()
+    assert RidgeCount.fits == 3 * 4 + 2
+    assert_allclose(
+        second.cv_results_["mean_test_score"], first.cv_results_["mean_test_score"]
+    )
+    assert second.best_params_ == first.best_params_
+
+
+def test_checkpoint_caches(tmp_path):
+    """Test that a resumed search with new caches (and bins) skips the store's fits."""
+
+    x = DataFrame({"a": arange(60.0), "b": arange(60.0) % 7})
+    y = Series(2 * x["a"] - x["b"] + arange(60.0) % 3)
+    path = str(tmp_path / "checkpoint.jsonl")
+
+    def search() -> GridSearchCV:
+        store = CheckpointStore(path)
+        pipeline = Pipeline(
+            [
+                ("scaler", StandardScaler()),
+                ("model", BinnedHGBCount(max_iter=5, random_state=42)),
+            ],
+            memory=MemoryCache(),
+        )
+        return GridSearchCV(
+            Checkpointed(with_bins(pipeline, BinsCache()), store),
+            {"model__learning_rate": [0.1, 0.2]},
+            scoring=CheckpointScorer(get_scorer("neg_mean_absolute_error"), store),
+            cv=TimeSeriesSplit(n_splits=3),
+        ).fit(x, y)
+
+    search()
+    assert BinnedHGBCount.fits == 2 * 3 + 1
+
+    # Only the refit on all the data is not in the store.
+    search()
+    assert BinnedHGBCount.fits == 2 * 3 + 2
+    assert len(CheckpointStore(path).scores) == 2 * 3
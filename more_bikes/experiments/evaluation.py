@@ -0,0 +1,227 @@
+"""Single-pass evaluation of pipelines without a parameter grid."""
+
+from math import ceil
+from typing import Any
+
+from lightgbm import LGBMRegressor
+from numpy import ndarray, zeros
+from pandas import DataFrame, Series
+from sklearn.base import clone
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.metrics import mean_absolute_error
+from sklearn.model_selection import BaseCrossValidator
+from sklearn.neural_network import MLPRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.utils import _safe_indexing
+from sklearn.utils._openmp_helpers import _openmp_effective_n_threads
+from sklearn.utils.parallel import Parallel, delayed
+
+from more_bikes.preprocessing.transformed_target_regressor import (
+    TransformedTargetRegressor,
+)
+
+# The regressors that can continue from the model of the previous fold.
+WarmRegressor = HistGradientBoostingRegressor | LGBMRegressor | MLPRegressor
+
+
+def _fit_score(
+    estimator: Any,
+    x: DataFrame,
+    y: Series,
+    train: ndarray | None,
+    test: ndarray | None,
+) -> tuple[Any, float | None]:
+    """Fit a clone of an estimator on `train` and score it on `test`, if any."""
+    estimator = clone(estimator)
+
+    if train is None:
+        return estimator.fit(x, y), None
+
+    estimator.fit(_safe_indexing(x, train), _safe_indexing(y, train))
+
+    assert test is not None
+    y_pred = estimator.predict(_safe_indexing(x, test))
+    return estimator, float(mean_absolute_error(_safe_indexing(y, test), y_pred))
+
+
+class _WarmHistGradientBoostingRegressor(HistGradientBoostingRegressor):
+    """
+    A `HistGradientBoostingRegressor` that bins the data of each fit afresh, even when
+    warm-started.
+
+    A warm start predicts the trees so far on the binned training (and validation)
+    data, by bin thresholds that only hold for the bins of their own fit. Here, they
+    are predicted on the raw data instead, by their numeric thresholds, as they are
+    when predicting, so each fit can bin its own data.
+    """
+
+    def fit(self, X, y, sample_weight=None):
+        # The raw data of each binned array of the fit, by its `id`.
+        self._raw_data: dict[int, tuple[Any, Any]] = {}
+        try:
+            return super().fit(X, y, sample_weight)
+        finally:
+            del self._raw_data
+
+    def _bin_data(self, X, is_training_data):
+        X_binned = super()._bin_data(X, is_training_data)
+        self._raw_data[id(X_binned)] = (X_binned, X)
+        return X_binned
+
+    def _raw_predict(self, X, n_threads=None):
+        X_binned, X_raw = getattr(self, "_raw_data", {}).get(id(X), (None, None))
+        if X_binned is not X:
+            return super()._raw_predict(X, n_threads)
+
+        raw_predictions = zeros(
+            (X_raw.shape[0], self.n_trees_per_iteration_),
+            dtype=self._baseline_prediction.dtype,
+            order="F",
+        )
+        raw_predictions += self._baseline_prediction
+        self._predict_iterations(
+            X_raw,
+            self._predictors,
+            raw_predictions,
+            False,
+            _openmp_effective_n_threads(n_threads),
+        )
+        return raw_predictions
+
+
+def _unwrap(estimator: Any) -> tuple[Any, Pipeline | None, Any]:
+    """The target transformer, preprocessing and regressor of an estimator."""
+    transformer = None
+    if isinstance(estimator, TransformedTargetRegressor):
+        transformer, estimator = estimator.transformer, estimator.regressor
+
+    if isinstance(estimator, Pipeline):
+        return transformer, estimator[:-1], estimator[-1]
+
+    return transformer, None, estimator
+
+
+def is_warm(estimator: Any) -> bool:
+    """Whether the regressor of an estimator can continue from a previous fold."""
+    regressor = _unwrap(estimator)[2]
+
+    # Early stopping by a scorer predicts a subsample of the binned training data, by
+    # the trees so far, which `_WarmHistGradientBoostingRegressor` cannot.
+    if isinstance(regressor, HistGradientBoostingRegressor):
+        return regressor.scoring == "loss" or regressor.early_stopping is False
+
+    return isinstance(regressor, WarmRegressor)
+
+
+def _warm_fit(regressor: Any, x: Any, y: Any, n_iter: int) -> Any:
+    """Fit a regressor, continuing from its current model up to `n_iter` iterations."""
+    if isinstance(regressor, LGBMRegressor):
+        booster = regressor.booster_ if regressor.__sklearn_is_fitted__() else None
+        done = booster.current_iteration() if booster is not None else 0
+        regressor.set_params(n_estimators=max(n_iter - done, 1))
+        return regressor.fit(x, y, init_model=booster)
+
+    if isinstance(regressor, MLPRegressor):
+        # `max_iter` is the number of epochs per fit, but `n_iter_` accumulates.
+        done = getattr(regressor, "n_iter_", 0)
+        return regressor.set_params(
+            warm_start=True, max_iter=max(n_iter - done, 1)
+        ).fit(x, y)
+
+    done = getattr(regressor, "n_iter_", 0)
+    return regressor.set_params(warm_start=True, max_iter=max(n_iter, done)).fit(x, y)
+
+
+def cross_val_warm(
+    estimator: Any, x: DataFrame, y: Series, cv: BaseCrossValidator
+) -> list[float]:
+    """
+    Score an estimator by cross-validation, continuing each fold's model from the
+    previous fold's rather than fitting it from scratch.
+
+    This suits expanding-window splits (e.g., `TimeSeriesSplit`), where each training
+    set extends the previous one: the model of each fold gets a share of the
+    iterations (`max_iter` or `n_estimators`) in proportion to its training set, so
+    the total cost is about one fit rather than one per fold. The preprocessing is
+    fitted on each fold as usual; if its features change, the regressor starts again.
+    """
+    transformer, preprocessing, regressor = _unwrap(clone(estimator))
+    if isinstance(regressor, HistGradientBoostingRegressor):
+        regressor = _WarmHistGradientBoostingRegressor(**regressor.get_params())
+
+    n_iter = regressor.get_params()[
+        "n_estimators" if isinstance(regressor, LGBMRegressor) else "max_iter"
+    ]
+
+    splits = list(cv.split(x, y))
+    n_last = len(splits[-1][0])
+
+    initial, features = regressor, None
+    scores: list[float] = []
+    for train, test in splits:
+        x_train, y_train = _safe_indexing(x, train), _safe_indexing(y, train)
+        x_test, y_test = _safe_indexing(x, test), _safe_indexing(y, test)
+
+        if transformer is not None:
+            transformer.fit(x_train, y_train)
+            y_train = transformer.transform(x_train, y_train)
+
+        if preprocessing is not None:
+            x_train = preprocessing.fit_transform(x_train, y_train)
+
+        features_ = list(getattr(x_train, "columns", range(x_train.shape[1])))
+        if features_ != features:
+            regressor, features = clone(initial), features_
+
+        _warm_fit(regressor, x_train, y_train, ceil(n_iter * len(train) / n_last))
+
+        y_pred = regressor.predict(
+            x_test if preprocessing is None else preprocessing.transform(x_test)
+        )
+        if transformer is not None:
+            y_pred = transformer.inverse_transform(x_test, y_pred)
+
+        scores.append(float(mean_absolute_error(y_test, y_pred)))
+
+    return scores
+
+
+def _fit(estimator: Any, x: DataFrame, y: Series) -> Any:
+    return clone(estimator).fit(x, y)
+
+
+def cross_val_refit(
+    estimator: Any,
+    x: DataFrame,
+    y: Series,
+    cv: BaseCrossValidator,
+    n_jobs: int | None = None,
+    pre_dispatch: int | str = "2*n_jobs",
+    warm_start: bool = False,
+) -> tuple[Any, list[float]]:
+    """
+    Fit an estimator on all the data and score it by cross-validation, in one pass.
+
+    The fit on all the data is one more job alongside the folds, dispatched first
+    because it is the longest, rather than a separate fit before or after them. If
+    `warm_start` and the regressor supports it, the folds are one job instead, by
+    `cross_val_warm`.
+    """
+    if warm_start and is_warm(estimator):
+        fitted, scores = Parallel(n_jobs=n_jobs, pre_dispatch=pre_dispatch)(
+            [
+                delayed(_fit)(estimator, x, y),
+                delayed(cross_val_warm)(estimator, x, y, cv),
+            ]
+        )  # type: ignore
+        return fitted, scores
+
+    splits: list[tuple[ndarray | None, ndarray | None]] = [(None, None)]
+    splits.extend(cv.split(x, y))
+
+    results = Parallel(n_jobs=n_jobs, pre_dispatch=pre_dispatch)(
+        delayed(_fit_score)(estimator, x, y, train, test) for train, test in splits
+    )
+
+    (fitted, _), *folds = results  # type: ignore
+    return fitted, [score for _, score in folds]
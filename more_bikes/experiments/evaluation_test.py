@@ -0,0 +1,102 @@
+"""Test the single-pass evaluation."""
+
+from lightgbm import LGBMRegressor
+from numpy import arange, mean, sin
+from numpy.random import default_rng
+from numpy.testing import assert_allclose
+from pandas import DataFrame, Series
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.metrics import make_scorer, mean_absolute_error
+from sklearn.model_selection import TimeSeriesSplit, cross_val_score
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from .evaluation import (
+    _WarmHistGradientBoostingRegressor,
+    cross_val_refit,
+    cross_val_warm,
+    is_warm,
+)
+
+
+def test_cross_val_refit():
+    """Test that the scores and the fit on all the data match separate passes."""
+
+    x = DataFrame({"a": arange(50.0), "b": arange(50.0) % 7})
+    y = Series(2 * x["a"] - x["b"] + arange(50.0) % 3)
+    cv = TimeSeriesSplit(n_splits=4)
+
+    estimator, scores = cross_val_refit(LinearRegression(), x, y, cv)
+
+    assert_allclose(
+        scores,
+        cross_val_score(
+            LinearRegression(), x, y, cv=cv, scoring=make_scorer(mean_absolute_error)
+        ),
+    )
+    assert_allclose(estimator.coef_, LinearRegression().fit(x, y).coef_)
+
+
+def test_cross_val_warm():
+    """Test that the later warm-started folds score close to cold-started ones."""
+
+    rng = default_rng(42)
+    x = DataFrame({"a": rng.normal(size=1000), "b": rng.normal(size=1000)})
+    y = Series(sin(x["a"]) * x["b"] + rng.normal(scale=0.1, size=1000))
+    cv = TimeSeriesSplit(n_splits=6)
+
+    for regressor in [
+        HistGradientBoostingRegressor(max_iter=120),
+        LGBMRegressor(n_estimators=120, verbose=-1),
+    ]:
+        estimator = make_pipeline(StandardScaler(), regressor)
+        assert is_warm(estimator)
+
+        scores = cross_val_warm(estimator, x, y, cv)
+
+        assert len(scores) == 6
+        assert_allclose(
+            scores[3:],
+            cross_val_score(
+                estimator, x, y, cv=cv, scoring=make_scorer(mean_absolute_error)
+            )[3:],
+            atol=0.05,
+        )
+
+    assert not is_warm(LinearRegression())
+
+
+def test_warm_bins():
+    """Test that a warm start bins each fit afresh, continuing the trees so far."""
+
+    rng = default_rng(42)
+
+    # With as many distinct values in each fit, the bins are the same as sklearn's.
+    x = DataFrame({"a": arange(1000) % 10, "b": rng.integers(0, 5, size=1000)})
+    y = Series(sin(x["a"]) * x["b"] + rng.normal(scale=0.1, size=1000))
+
+    warm = _WarmHistGradientBoostingRegressor(max_iter=20, warm_start=True)
+    cold = HistGradientBoostingRegressor(max_iter=20, warm_start=True)
+    for regressor in [warm, cold]:
+        regressor.fit(x[:500], y[:500])
+        regressor.set_params(max_iter=40).fit(x, y)
+
+    assert_allclose(warm.predict(x), cold.predict(x))
+
+    # A feature whose range grows: the later folds need bins beyond the first's.
+    x = DataFrame(
+        {"a": arange(2200) / 100 + rng.normal(size=2200), "b": rng.normal(size=2200)}
+    )
+    y = Series(5 * sin(x["a"]) + x["b"] + rng.normal(scale=0.1, size=2200))
+    cv = TimeSeriesSplit(n_splits=10)
+    estimator = HistGradientBoostingRegressor(random_state=42)
+
+    scores = cross_val_warm(estimator, x, y, cv)
+    assert mean(scores[5:]) < 1.5 * mean(
+        cross_val_score(
+            estimator, x, y, cv=cv, scoring=make_scorer(mean_absolute_error)
+        )[5:]
+    )
+
+    assert not is_warm(HistGradientBoostingRegressor(scoring="r2"))
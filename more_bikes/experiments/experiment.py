@@ -1,30 +1,52 @@
 """Experiment classes."""
 
 from abc import ABCMeta, abstractmethod
-from contextlib import redirect_stdout
-from dataclasses import dataclass, field
-from typing import Self
-
-from numpy import ndarray
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import dataclass, field, replace
+from io import StringIO
+from typing import Any, Iterator, Self, TextIO
+
+from joblib import Memory
+from joblib import hash as hash_
+from joblib import parallel_backend
+from numpy import mean, ndarray
 from pandas import DataFrame, Series
+from sklearn.base import clone
 
 # pylint: disable=unused-import
 from sklearn.experimental import enable_halving_search_cv
 from sklearn.feature_selection import VarianceThreshold
-from sklearn.metrics import make_scorer, mean_absolute_error
+from sklearn.metrics import get_scorer
 from sklearn.model_selection import (
     BaseCrossValidator,
     GridSearchCV,
     HalvingGridSearchCV,
-    cross_val_score,
 )
 from sklearn.pipeline import Pipeline
 from sklearn.utils import Bunch
+from threadpoolctl import threadpool_limits
 
 from more_bikes.data.data_loader import DataLoader, DataLoaderTestN, DataLoaderTrainN
 from more_bikes.data.feature import BIKES, Feature
+from more_bikes.experiments.artifact import (
+    Artifact,
+    artifact_path,
+    load_artifact,
+    save_artifact,
+)
+from more_bikes.experiments.bayes_search import TPESearchCV
+from more_bikes.experiments.binned import BinsCache, with_bins
+from more_bikes.experiments.checkpoint import (
+    Checkpointed,
+    CheckpointScorer,
+    CheckpointStore,
+    checkpoint_path,
+)
+from more_bikes.experiments.evaluation import cross_val_refit
 from more_bikes.experiments.params.cv import time_series_split
 from more_bikes.experiments.params.util import ParamGrid, SearchStrategy
+from more_bikes.experiments.staged_search import StagedGridSearchCV
+from more_bikes.preprocessing.fused_transformer import FusedTransformer
 from more_bikes.preprocessing.transformed_target_regressor import (
     TransformedTargetRegressor,
 )
@@ -39,6 +61,7 @@ from more_bikes.preprocessing.util import (
     submission,
 )
 from more_bikes.util.log import create_logger
+from more_bikes.util.memory import MemoryCache, fingerprint
 
 SCORING = "neg_mean_absolute_error"
 
@@ -60,6 +83,76 @@ class Processing:
     submit: Submission = field(default_factory=lambda: submission)
 
 
+@dataclass
+class Execution:
+    """Execution specification."""
+
+    # The number of workers, as for `joblib`: for independent experiments (e.g.,
+    # stations) if there are any, each of which then searches and cross-validates in
+    # its worker, and otherwise for searches and cross-validation.
+    n_jobs: int | None = None
+
+    # The `joblib` backend, e.g., "loky" (processes) or "threading".
+    backend: str = "loky"
+
+    # The number of jobs to dispatch ahead of the workers, as for `joblib`.
+    pre_dispatch: int | str = "2*n_jobs"
+
+    # If set, the maximum number of BLAS/OpenMP threads (e.g., for LightGBM) per worker,
+    # so that parallel workers do not oversubscribe the cores.
+    threads: int | None = None
+
+    # If set, cross-validate pipelines without a parameter grid by continuing each
+    # fold's model from the previous fold's (for HGBR, LightGBM and MLP regressors).
+    warm_start: bool = False
+
+    # The cache of the fitted preprocessing of a search's pipelines: "memory" to keep it
+    # in memory (per process), a directory to keep it on disk, or None.
+    cache: str | None = None
+
+    # If set, save the fitted model of each run, with its scores and a fingerprint of
+    # its training data and parameters (ignored by git), e.g., to predict only later.
+    artifacts: bool = False
+
+    # If set, predict with the saved models rather than search and fit them again.
+    predict_only: bool = False
+
+    # If set, append the score of each (candidate, fold) of a search to a store as soon
+    # as it is computed, and skip the ones in the store, to resume a search that died.
+    checkpoint: bool = False
+
+    # The most candidates of a "bayes" search.
+    trials: int = 50
+
+    # If set, the seconds after which a "bayes" search starts no more candidates.
+    timeout: float | None = None
+
+    # The seed of the randomised searches ("halving" subsamples and "bayes" proposes
+    # candidates by it), so that each run searches the same way, e.g., to resume it.
+    random_state: int | None = 42
+
+    def memory(self) -> MemoryCache | Memory | None:
+        """A new cache for the preprocessing of a search's pipelines, if any."""
+        if not self.cache:
+            return None
+        if self.cache == "memory":
+            return MemoryCache()
+        return Memory(self.cache, verbose=0)
+
+    @contextmanager
+    def context(self) -> Iterator[None]:
+        """Run with the backend and the limit on nested threads."""
+        inner = (
+            {"inner_max_num_threads": self.threads} if self.backend == "loky" else {}
+        )
+        with parallel_backend(self.backend, n_jobs=self.n_jobs, **inner):
+            if self.threads is None:
+                yield
+            else:
+                with threadpool_limits(limits=self.threads):
+                    yield
+
+
 @dataclass
 class Model:
     """Model specification."""
@@ -85,6 +178,10 @@ class Experiment(metaclass=ABCMeta):
     # The cross-validation scores of the experiment.
     scores: DataFrame | None = None
 
+    # If set, the verbose output of each search is appended here rather than written
+    # to the CV log, e.g., by a worker whose output the parent process writes.
+    cv_logs: list[str] | None = None
+
     def __init__(
         self,
         output_path: str,
@@ -92,12 +189,14 @@ class Experiment(metaclass=ABCMeta):
         processing: Processing = Processing(),
         cv: BaseCrossValidator = time_series_split,
         search: SearchStrategy = "grid",
+        execution: Execution = Execution(),
     ) -> None:
         self._output_path = output_path
         self._processing = processing
         self._model = model
         self._cv = cv
         self._search = search
+        self._execution = execution
 
         self._logger = create_logger(self._model.name, self._output_path)
 
@@ -135,41 +234,123 @@ class Experiment(metaclass=ABCMeta):
                 index=False,
             )
 
+    def configure(self, **changes) -> Self:
+        """Change the execution specification, e.g., from command-line arguments."""
+        self._execution = replace(self._execution, **changes)
+        return self
+
+    def _fingerprint(self, x_train: DataFrame, y_train: Series) -> str:
+        """A fingerprint of the training data, model and parameters."""
+        return hash_(
+            (
+                fingerprint(x_train),
+                fingerprint(y_train),
+                self._model.pipeline,
+                self._model.params,
+                self._model.scoring,
+                self._cv,
+                self._search,
+            )
+        )
+
     def _run(
-        self, x_train: DataFrame, y_train: Series, x_test: DataFrame
+        self,
+        x_train: DataFrame,
+        y_train: Series,
+        x_test: DataFrame,
+        key: str | None = None,
     ) -> tuple[DataFrame, float, DataFrame]:
+        path = artifact_path(self._output_path, self._model.name, key)
+
+        # If predicting only, predict with the saved model.
+        if self._execution.predict_only:
+            artifact = load_artifact(path, self._fingerprint(x_train, y_train))
+            self._logger.info("score %.3f", -artifact.score)
+
+            y_pred = artifact.estimator.predict(x_test)
+
+            return self._output(x_test, y_pred, artifact.score, artifact.scores)
+
         # If there is a parameter grid, search it.
         if self._cv is not None and self._model.params is not None:
-            outfile = f"{self._output_path}/{self._model.name}_cv.log"
-            open(outfile, "a", encoding="utf-8").close()
-            with open(outfile, "w", encoding="utf-8") as out:
+            # The bins of the folds of this search, shared by its candidates.
+            bins = BinsCache()
+            estimator: Any = with_bins(
+                self._with_memory(self._model.pipeline, self._execution.memory()),
+                bins,
+            )
+            scoring: Any = self._model.scoring
+
+            # The staged search scores staged predictions, not fitted estimators.
+            if self._execution.checkpoint and self._search != "staged":
+                store = CheckpointStore(
+                    checkpoint_path(self._output_path, self._model.name, key)
+                )
+                estimator = Checkpointed(estimator, store)
+                scoring = CheckpointScorer(get_scorer(scoring), store)
+
+            with self._cv_log() as out:
                 with redirect_stdout(out):
                     # Halving grid search.
                     if self._search == "halving":
                         search = HalvingGridSearchCV(
-                            estimator=self._model.pipeline,
+                            estimator=estimator,
                             param_grid=self._model.params,
-                            scoring=self._model.scoring,
+                            scoring=scoring,
                             refit=True,
                             cv=self._cv,
                             verbose=4,
                             aggressive_elimination=True,
+                            n_jobs=self._execution.n_jobs,
+                            random_state=self._execution.random_state,
+                        )
+                    # Grid search, fitting each boosted model once per fold.
+                    elif self._search == "staged":
+                        search = StagedGridSearchCV(
+                            estimator=estimator,
+                            param_grid=self._model.params,
+                            scoring=scoring,
+                            cv=self._cv,
+                            n_jobs=self._execution.n_jobs,
+                            pre_dispatch=self._execution.pre_dispatch,
+                            verbose=4,
+                        )
+                    # Tree-structured Parzen estimator search, within a budget.
+                    elif self._search == "bayes":
+                        search = TPESearchCV(
+                            estimator=estimator,
+                            param_grid=self._model.params,
+                            scoring=scoring,
+                            cv=self._cv,
+                            n_trials=self._execution.trials,
+                            timeout=self._execution.timeout,
+                            n_jobs=self._execution.n_jobs,
+                            pre_dispatch=self._execution.pre_dispatch,
+                            random_state=self._execution.random_state,
+                            verbose=4,
                         )
                     # Grid search.
                     else:
                         search = GridSearchCV(
-                            estimator=self._model.pipeline,
+                            estimator=estimator,
                             param_grid=self._model.params,
-                            scoring=(self._model.scoring),
+                            scoring=scoring,
                             refit=self._model.scoring,
                             cv=self._cv,
                             verbose=4,
+                            n_jobs=self._execution.n_jobs,
+                            pre_dispatch=self._execution.pre_dispatch,
                         )
-                    search.fit(x_train, y_train)
+                    with self._execution.context():
+                        search.fit(x_train, y_train)
+                    bins.clear()
 
             self._logger.info("score %.3f", -search.best_score_)
             self._logger.info("params %s", search.best_params_)
-            self._save_attrs(search.best_estimator_)  # type: ignore
+            best_estimator = search.best_estimator_
+            if isinstance(best_estimator, Checkpointed):
+                best_estimator = best_estimator.fit_pending()
+            self._save_attrs(best_estimator)  # type: ignore
 
             best_scores: list[float] = []
             for index in range(search.n_splits_):
@@ -182,30 +363,91 @@ class Experiment(metaclass=ABCMeta):
 
             y_pred = search.predict(x_test)
 
+            if self._execution.artifacts:
+                save_artifact(
+                    path,
+                    Artifact(
+                        self._with_memory(best_estimator, None),
+                        search.best_score_,
+                        best_scores,
+                        search.cv_results_,
+                        self._fingerprint(x_train, y_train),
+                    ),
+                )
+
             return self._output(x_test, y_pred, search.best_score_, best_scores)
 
         # If there is no parameter grid, run the pipeline.
-        return self._run_pipeline(x_train, y_train, x_test)
+        return self._run_pipeline(x_train, y_train, x_test, path)
 
     def _run_pipeline(
-        self, x_train: DataFrame, y_train: Series, x_test: DataFrame
+        self, x_train: DataFrame, y_train: Series, x_test: DataFrame, path: str
     ) -> tuple[DataFrame, float, DataFrame]:
-        self._model.pipeline.fit(x_train, y_train)
+        with self._execution.context():
+            pipeline, scores = cross_val_refit(
+                self._model.pipeline,
+                x_train,
+                y_train,
+                cv=self._cv,
+                n_jobs=self._execution.n_jobs,
+                pre_dispatch=self._execution.pre_dispatch,
+                warm_start=self._execution.warm_start,
+            )
 
-        y_pred = self._model.pipeline.predict(x_test)
-        assert not isinstance(y_pred, tuple)
+            y_pred = pipeline.predict(x_test)
+            assert not isinstance(y_pred, tuple)
 
-        scores = cross_val_score(
-            self._model.pipeline,
-            x_train,
-            y_train,
-            cv=self._cv,
-            scoring=make_scorer(mean_absolute_error),
-        )
+        score = float(mean(scores))
+        self._logger.info("score %.3f", score)
 
-        self._logger.info("score %.3f", scores.mean())
+        if self._execution.artifacts:
+            save_artifact(
+                path,
+                Artifact(
+                    pipeline, -score, scores, None, self._fingerprint(x_train, y_train)
+                ),
+            )
 
-        return self._output(x_test, y_pred, -float(scores.mean()), list(scores))
+        return self._output(x_test, y_pred, -score, scores)
+
+    @contextmanager
+    def _cv_log(self) -> Iterator[TextIO]:
+        """The stream of the verbose output of a search."""
+        if self.cv_logs is None:
+            with self.write_cv_log() as out:
+                yield out
+        else:
+            with StringIO() as out:
+                yield out
+                self.cv_logs.append(out.getvalue())
+
+    @contextmanager
+    def write_cv_log(self) -> Iterator[TextIO]:
+        """Write the CV log, replacing that of the previous search."""
+        outfile = f"{self._output_path}/{self._model.name}_cv.log"
+        open(outfile, "a", encoding="utf-8").close()
+        with open(outfile, "w", encoding="utf-8") as out:
+            yield out
+
+    def _with_memory(
+        self,
+        estimator: Pipeline | TransformedTargetRegressor,
+        memory: MemoryCache | Memory | None,
+    ) -> Pipeline | TransformedTargetRegressor:
+        """
+        A clone of the estimator whose pipeline caches its steps in `memory`, or the
+        (fitted) estimator itself without a cache if there is no `memory`.
+        """
+        if memory is not None:
+            estimator = clone(estimator)
+
+        if isinstance(estimator, Pipeline):
+            return estimator.set_params(memory=memory)
+        if isinstance(estimator, TransformedTargetRegressor) and isinstance(
+            estimator.regressor, Pipeline
+        ):
+            return estimator.set_params(regressor__memory=memory)
+        return estimator
 
     def _named_steps(self, estimator: Pipeline | TransformedTargetRegressor) -> Bunch:
         """The named steps of the pipeline."""
@@ -226,22 +468,30 @@ class Experiment(metaclass=ABCMeta):
         for named_step_name in named_steps:
             named_step = named_steps[named_step_name]
 
+            if isinstance(named_step, FusedTransformer):
+                self._save_variances(
+                    named_step.variance_features_, named_step.variance_threshold_
+                )
+
             if hasattr(named_step, "transformers_"):
                 for _, transformer, *_args in named_step.transformers_:
-                    transformer_name: str = transformer.__class__.__name__
-                    transformer_name = transformer_name.lower()
-
                     if isinstance(transformer, VarianceThreshold):
-                        DataFrame(
-                            {
-                                "feature": transformer.feature_names_in_,
-                                "variance": transformer.variances_,
-                                "support": transformer.get_support(),
-                            }
-                        ).to_csv(
-                            f"{self._output_path}/{self._model.name}_{transformer_name}.csv",
-                            index=False,
-                        )
+                        self._save_variances(transformer.feature_names_in_, transformer)
+
+    def _save_variances(self, features: Any, transformer: VarianceThreshold) -> None:
+        """Save the variances of the features to a CSV."""
+        transformer_name = transformer.__class__.__name__.lower()
+
+        DataFrame(
+            {
+                "feature": features,
+                "variance": transformer.variances_,
+                "support": transformer.get_support(),
+            }
+        ).to_csv(
+            f"{self._output_path}/{self._model.name}_{transformer_name}.csv",
+            index=False,
+        )
 
 
 class TaskExperiment(Experiment):
@@ -255,10 +505,11 @@ class TaskExperiment(Experiment):
         cv: BaseCrossValidator = time_series_split,
         search: SearchStrategy = "grid",
         train: DataLoader = DataLoaderTrainN(),
+        execution: Execution = Execution(),
     ) -> None:
         self._output_path = f"./more_bikes/experiments/task_{task}/{model.name}"
         self.train = train
-        super().__init__(self._output_path, model, processing, cv, search)
+        super().__init__(self._output_path, model, processing, cv, search, execution)
 
     def run(self) -> Self:
         """Run the task experiment."""
@@ -5,7 +5,7 @@ from typing import Callable, TypeVar
 from sklearn import set_config
 
 from more_bikes.experiments.experiment import Experiment
-from more_bikes.util.args import get_task_args
+from more_bikes.util.args import get_execution_args, get_task_args
 
 TypeTaskExperiment = TypeVar("TypeTaskExperiment", bound=Experiment)
 
@@ -17,5 +17,7 @@ def run_experiments(task_experiments: TaskExperiments):
 
     set_config(transform_output="pandas")
 
+    changes = get_execution_args()
+
     for arg in get_task_args():
-        task_experiments[arg]().run().save()
+        task_experiments[arg]().configure(**changes).run().save()
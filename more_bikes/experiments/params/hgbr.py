@@ -14,22 +14,20 @@ min_samples_leaf = [1]
 
 
 fixed = {
-    "regressor__histgradientboostingregressor__categorical_features": [
-        categorical_features
-    ],
-    "regressor__histgradientboostingregressor__loss": ["absolute_error"],
-    "regressor__histgradientboostingregressor__scoring": [SCORING],
+    "regressor__binnedhgbregressor__categorical_features": [categorical_features],
+    "regressor__binnedhgbregressor__loss": ["absolute_error"],
+    "regressor__binnedhgbregressor__scoring": [SCORING],
 }
 
 best_params: ParamGrid = [
     {
         **fixed,
-        "regressor__histgradientboostingregressor__l2_regularization": [0.2],
-        "regressor__histgradientboostingregressor__learning_rate": [0.1],
-        "regressor__histgradientboostingregressor__max_depth": [50],
-        "regressor__histgradientboostingregressor__max_iter": [100],
-        "regressor__histgradientboostingregressor__max_leaf_nodes": [15],
-        "regressor__histgradientboostingregressor__min_samples_leaf": [2],
+        "regressor__binnedhgbregressor__l2_regularization": [0.2],
+        "regressor__binnedhgbregressor__learning_rate": [0.1],
+        "regressor__binnedhgbregressor__max_depth": [50],
+        "regressor__binnedhgbregressor__max_iter": [100],
+        "regressor__binnedhgbregressor__max_leaf_nodes": [15],
+        "regressor__binnedhgbregressor__min_samples_leaf": [2],
     }
 ]
 
@@ -37,12 +35,12 @@ best_params: ParamGrid = [
 params: ParamGrid = [
     {
         **fixed,
-        "regressor__histgradientboostingregressor__l2_regularization": l2_regularization,
-        "regressor__histgradientboostingregressor__learning_rate": learning_rate,
-        "regressor__histgradientboostingregressor__max_depth": max_depth,
-        "regressor__histgradientboostingregressor__max_iter": max_iter,
-        "regressor__histgradientboostingregressor__max_leaf_nodes": max_leaf_nodes,
-        "regressor__histgradientboostingregressor__min_samples_leaf": min_samples_leaf,
+        "regressor__binnedhgbregressor__l2_regularization": l2_regularization,
+        "regressor__binnedhgbregressor__learning_rate": learning_rate,
+        "regressor__binnedhgbregressor__max_depth": max_depth,
+        "regressor__binnedhgbregressor__max_iter": max_iter,
+        "regressor__binnedhgbregressor__max_leaf_nodes": max_leaf_nodes,
+        "regressor__binnedhgbregressor__min_samples_leaf": min_samples_leaf,
     }
 ]
 
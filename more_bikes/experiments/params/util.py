@@ -2,6 +2,6 @@
 
 from typing import Any, Literal
 
-SearchStrategy = Literal["grid", "halving"]
+SearchStrategy = Literal["grid", "halving", "staged", "bayes"]
 
 ParamGrid = list[dict[str, list[Any]]]
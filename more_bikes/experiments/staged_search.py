@@ -0,0 +1,335 @@
+"""Grid search that scores every iteration count of a boosted model from one fit."""
+
+# pylint: disable=attribute-defined-outside-init
+
+from time import time
+from traceback import format_exc
+from typing import Any
+from warnings import warn
+
+from lightgbm import LGBMRegressor
+from numpy import array, empty, inf, isnan, mean, nan, ndarray, std, where
+from pandas import DataFrame, Series
+from scipy.stats import rankdata
+from sklearn.base import BaseEstimator, clone
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.exceptions import FitFailedWarning
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import BaseCrossValidator, ParameterGrid
+from sklearn.utils import _safe_indexing
+from sklearn.utils.parallel import Parallel, delayed
+
+from more_bikes.experiments.evaluation import _unwrap
+from more_bikes.experiments.params.util import ParamGrid
+
+# The boosting types of LightGBM whose models of fewer iterations are prefixes of the
+# model of the most iterations (unlike, e.g., "dart", which rescales earlier trees).
+LGBM_STAGED = ["gbdt", "goss"]
+
+# A group of candidates: their parameters other than the number of iterations, and
+# the numbers of iterations (or None if the candidate cannot be staged).
+Group = tuple[dict[str, Any], list[int] | None]
+
+
+class _Predicted:
+    """An estimator that predicts fixed predictions, to score them with a scorer."""
+
+    def __init__(self, y_pred: ndarray):
+        self.y_pred = y_pred
+
+    def predict(self, _x):
+        """Predict."""
+        return self.y_pred
+
+
+def _iterations_param(estimator: Any) -> str | None:
+    """The name of the parameter of the number of iterations of the regressor, if any."""
+    _, _, regressor = _unwrap(estimator)
+
+    if isinstance(regressor, LGBMRegressor):
+        name = "n_estimators"
+    elif isinstance(regressor, HistGradientBoostingRegressor):
+        name = "max_iter"
+    else:
+        return None
+
+    if estimator is regressor:
+        return name
+    for param, value in estimator.get_params(deep=True).items():
+        if value is regressor:
+            return f"{param}__{name}"
+    return None
+
+
+def _is_staged(estimator: Any) -> bool:
+    """Whether the models of fewer iterations are prefixes of the estimator's."""
+    _, _, regressor = _unwrap(estimator)
+
+    if isinstance(regressor, LGBMRegressor):
+        return regressor.boosting_type in LGBM_STAGED
+    return isinstance(regressor, HistGradientBoostingRegressor)
+
+
+def _staged_predict(estimator: Any, x: DataFrame, iterations: list[int]) -> list[Any]:
+    """The predictions of a fitted estimator after each number of iterations."""
+    transformer, preprocessing, regressor = _unwrap(estimator)
+
+    xt = x if preprocessing is None else preprocessing.transform(x)
+
+    if isinstance(regressor, LGBMRegressor):
+        y_preds = [regressor.predict(xt, num_iteration=n_iter) for n_iter in iterations]
+    else:
+        # Early stopping may stop before some of the iterations: use the last.
+        staged = list(regressor.staged_predict(xt))
+        y_preds = [staged[min(n_iter, len(staged)) - 1] for n_iter in iterations]
+
+    if transformer is None:
+        return y_preds
+    return [transformer.inverse_transform(x, y_pred) for y_pred in y_preds]
+
+
+def _fit_score_staged(
+    estimator: Any,
+    params: dict[str, Any],
+    iterations: list[int] | None,
+    iterations_param: str | None,
+    scorer: Any,
+    x: DataFrame,
+    y: Series,
+    train: ndarray,
+    test: ndarray,
+    verbose: int,
+    error_score: Any,
+) -> tuple[list[float], float, float, str | None]:
+    """
+    Fit a clone of an estimator with the most iterations on `train`, and score it on
+    `test` after each number of iterations (or once, if there are none).
+
+    If the fit fails, every score is `error_score` (and the error is returned), as in
+    `GridSearchCV`, unless it is "raise".
+    """
+    estimator = clone(estimator).set_params(**params)
+    if iterations is not None:
+        estimator.set_params(**{iterations_param: max(iterations)})
+
+    start = time()
+    try:
+        estimator.fit(_safe_indexing(x, train), _safe_indexing(y, train))
+    except Exception:  # pylint: disable=broad-exception-caught
+        if error_score == "raise":
+            raise
+        fit_time = time() - start
+        if verbose > 1:
+            print(f"[CV] END {params}; score=nan (fit failed)")
+        return [error_score] * len(iterations or [None]), fit_time, 0.0, format_exc()
+    fit_time = time() - start
+
+    start = time()
+    x_test, y_test = _safe_indexing(x, test), _safe_indexing(y, test)
+    y_preds = (
+        [estimator.predict(x_test)]
+        if iterations is None
+        else _staged_predict(estimator, x_test, iterations)
+    )
+    scores = [float(scorer(_Predicted(y_pred), x_test, y_test)) for y_pred in y_preds]
+    score_time = (time() - start) / len(scores)
+
+    if verbose > 1:
+        for n_iter, score in zip(iterations or [None], scores):
+            stage = "" if n_iter is None else f" {iterations_param}={n_iter}"
+            print(f"[CV] END {params}{stage}; score={score:.3f}")
+
+    return scores, fit_time, score_time, None
+
+
+class StagedGridSearchCV(BaseEstimator):
+    """
+    An exhaustive grid search that fits each boosted model once per fold.
+
+    The candidates that differ only by the number of iterations (`n_estimators` of a
+    LightGBM or `max_iter` of an HGBR regressor) are fitted once, with the most
+    iterations, and scored by their staged predictions after each number. The
+    results have the same form and order as those of `GridSearchCV`, with a candidate
+    for each number of iterations.
+    """
+
+    def __init__(
+        self,
+        estimator: Any,
+        param_grid: ParamGrid,
+        scoring: Any = None,
+        cv: BaseCrossValidator | None = None,
+        n_jobs: int | None = None,
+        pre_dispatch: int | str = "2*n_jobs",
+        verbose: int = 0,
+        error_score: Any = nan,
+    ):
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.scoring = scoring
+        self.cv = cv
+        self.n_jobs = n_jobs
+        self.pre_dispatch = pre_dispatch
+        self.verbose = verbose
+        self.error_score = error_score
+
+    def _groups(
+        self, candidates: list[dict[str, Any]], iterations_param: str | None
+    ) -> tuple[list[Group], list[tuple[int, int]]]:
+        """
+        The candidates, grouped by their parameters other than the iterations, and the
+        group of each candidate with the index of its number of iterations in it.
+        """
+        groups: list[Group] = []
+        keys: dict[str, int] = {}
+        members: list[tuple[int, int | None]] = []
+
+        for params in candidates:
+            if iterations_param not in params or not _is_staged(
+                clone(self.estimator).set_params(**params)
+            ):
+                members.append((len(groups), None))
+                groups.append((params, None))
+                continue
+
+            others = {
+                param: value
+                for param, value in params.items()
+                if param != iterations_param
+            }
+            group = keys.setdefault(repr(sorted(others.items())), len(groups))
+            if group == len(groups):
+                groups.append((others, []))
+            iterations = groups[group][1]
+            assert iterations is not None
+            iterations.append(params[iterations_param])
+            members.append((group, params[iterations_param]))
+
+        groups = [
+            (params, None if iterations is None else sorted(set(iterations)))
+            for params, iterations in groups
+        ]
+        stages = [
+            (group, (groups[group][1] or [None]).index(n_iter))
+            for group, n_iter in members
+        ]
+        return groups, stages
+
+    def fit(self, X: DataFrame, y: Series):
+        """Search the grid and refit the best candidate on all the data."""
+        assert self.cv is not None
+        scorer = check_scoring(self.estimator, self.scoring)
+        iterations_param = _iterations_param(self.estimator)
+        candidates = list(ParameterGrid(self.param_grid))
+        groups, stages = self._groups(candidates, iterations_param)
+        splits = list(self.cv.split(X, y))
+
+        results = Parallel(n_jobs=self.n_jobs, pre_dispatch=self.pre_dispatch)(
+            delayed(_fit_score_staged)(
+                self.estimator,
+                params,
+                iterations,
+                iterations_param,
+                scorer,
+                X,
+                y,
+                train,
+                test,
+                self.verbose,
+                self.error_score,
+            )
+            for params, iterations in groups
+            for train, test in splits
+        )
+        _warn_fit_failures(
+            [error for *_, error in results if error is not None],
+            len(results),
+            self.error_score,
+        )
+
+        # The results of each candidate, in the order of the grid.
+        scores: list[list[float]] = []
+        fit_times: list[list[float]] = []
+        score_times: list[list[float]] = []
+
+        for group, stage in stages:
+            folds = results[group * len(splits) : (group + 1) * len(splits)]
+            scores.append([fold[0][stage] for fold in folds])
+            fit_times.append([fold[1] for fold in folds])
+            score_times.append([fold[2] for fold in folds])
+
+        self.cv_results_ = _format_results(
+            candidates, array(scores), array(fit_times), array(score_times)
+        )
+        self.n_splits_ = len(splits)
+        self.best_index_ = int(self.cv_results_["rank_test_score"].argmin())
+        self.best_score_ = float(self.cv_results_["mean_test_score"][self.best_index_])
+        self.best_params_ = candidates[self.best_index_]
+
+        start = time()
+        self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_)
+        self.best_estimator_.fit(X, y)
+        self.refit_time_ = time() - start
+
+        return self
+
+    def predict(self, X: DataFrame):
+        """Predict with the best estimator."""
+        return self.best_estimator_.predict(X)
+
+
+def _warn_fit_failures(errors: list[str], n_fits: int, error_score: Any) -> None:
+    """Warn of the fits that failed, or raise if every fit did, as `GridSearchCV`."""
+    if not errors:
+        return
+
+    summary = "\n".join(
+        f"{errors.count(error)} fits failed with the following error:\n{error}"
+        for error in dict.fromkeys(errors)
+    )
+    if len(errors) == n_fits:
+        raise ValueError(
+            f"All the {n_fits} fits failed.\nBelow are more details about the "
+            f"failures:\n{summary}"
+        )
+    warn(
+        f"\n{len(errors)} fits failed out of a total of {n_fits}.\nThe score on these "
+        f"train-test partitions for these parameters will be set to {error_score}.\n"
+        f"Below are more details about the failures:\n{summary}",
+        FitFailedWarning,
+    )
+
+
+def _format_results(
+    candidates: list[dict[str, Any]],
+    scores: ndarray,
+    fit_times: ndarray,
+    score_times: ndarray,
+) -> dict[str, Any]:
+    """The results of a search, in the form of `GridSearchCV.cv_results_`."""
+    results: dict[str, Any] = {"params": candidates}
+
+    for param in sorted({param for candidate in candidates for param in candidate}):
+        # Fill an object array, as the values may be sequences themselves.
+        results[f"param_{param}"] = empty(len(candidates), dtype=object)
+        for index, candidate in enumerate(candidates):
+            results[f"param_{param}"][index] = candidate.get(param, nan)
+
+    for index in range(scores.shape[1]):
+        results[f"split{index}_test_score"] = scores[:, index]
+
+    for name, values in [
+        ("test_score", scores),
+        ("fit_time", fit_times),
+        ("score_time", score_times),
+    ]:
+        results[f"mean_{name}"] = mean(values, axis=1)
+        results[f"std_{name}"] = std(values, axis=1)
+
+    # Rank the candidates whose scores are `nan` last, as `GridSearchCV` does.
+    mean_scores = results["mean_test_score"]
+    results["rank_test_score"] = rankdata(
+        -where(isnan(mean_scores), -inf, mean_scores), method="min"
+    ).astype(int)
+
+    return results
@@ -0,0 +1,91 @@
+"""Test the staged grid search."""
+
+from warnings import catch_warnings
+
+from lightgbm import LGBMRegressor
+from numpy import arange, isnan
+from numpy.random import default_rng
+from numpy.testing import assert_allclose, assert_array_equal
+from pandas import DataFrame
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.exceptions import FitFailedWarning
+from sklearn.model_selection import GridSearchCV, TimeSeriesSplit
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from more_bikes.preprocessing.bikes_fraction_transformer import BikesFractionTransformer
+from more_bikes.preprocessing.transformed_target_regressor import (
+    TransformedTargetRegressor,
+)
+
+from .staged_search import StagedGridSearchCV
+
+
+def test_staged_grid_search():
+    """Test that the staged search scores every candidate as the grid search does."""
+
+    rng = default_rng(42)
+    x = DataFrame(rng.normal(size=(300, 3)), columns=["a", "b", "c"])
+    x["docks"] = 10 + arange(300) % 5
+    y = x["docks"] * (1 + x["a"] / 3 + rng.normal(size=300) / 10)
+    cv = TimeSeriesSplit(n_splits=3)
+
+    for regressor, params in [
+        (
+            LGBMRegressor(random_state=42, verbose=-1),
+            {
+                "boosting_type": ["gbdt", "dart"],
+                "learning_rate": [0.1, 0.3],
+                "n_estimators": [5, 10, 20],
+                # Ties, after the iterations in the order of the grid.
+                "subsample_for_bin": [200000, 300000],
+            },
+        ),
+        (
+            HistGradientBoostingRegressor(
+                early_stopping=True, n_iter_no_change=2, random_state=42
+            ),
+            {
+                "learning_rate": [0.1, 0.3],
+                "max_iter": [5, 10, 50],
+                # A fit that fails (of a single leaf), scored `nan`.
+                "max_leaf_nodes": [1, 31],
+            },
+        ),
+    ]:
+        name = regressor.__class__.__name__.lower()
+        estimator = TransformedTargetRegressor(
+            make_pipeline(StandardScaler(), regressor), BikesFractionTransformer()
+        )
+        param_grid = {
+            f"regressor__{name}__{param}": values for param, values in params.items()
+        }
+
+        with catch_warnings(record=True) as expected_warnings:
+            expected = GridSearchCV(
+                estimator, param_grid, scoring="neg_mean_absolute_error", cv=cv
+            ).fit(x, y)
+        with catch_warnings(record=True) as actual_warnings:
+            actual = StagedGridSearchCV(
+                estimator, param_grid, scoring="neg_mean_absolute_error", cv=cv
+            ).fit(x, y)
+
+        assert actual.cv_results_["params"] == expected.cv_results_["params"]
+        assert_allclose(
+            actual.cv_results_["mean_test_score"],
+            expected.cv_results_["mean_test_score"],
+        )
+        assert_array_equal(
+            actual.cv_results_["rank_test_score"],
+            expected.cv_results_["rank_test_score"],
+        )
+        assert [warning.category for warning in actual_warnings] == [
+            warning.category
+            for warning in expected_warnings
+            if warning.category is FitFailedWarning
+        ]
+        assert isnan(actual.cv_results_["mean_test_score"]).any() == (
+            name == "histgradientboostingregressor"
+        )
+        assert actual.best_params_ == expected.best_params_
+        assert_allclose(actual.predict(x), expected.predict(x))
@@ -1,13 +1,21 @@
 """Task 1A experiment class."""
 
+from copy import copy
+from dataclasses import replace
+from logging import LogRecord
+
+from joblib import parallel_backend
 from pandas import DataFrame, concat
 from sklearn.model_selection import BaseCrossValidator
+from sklearn.utils.parallel import Parallel, delayed
 
 from more_bikes.data.data_loader import DataLoaderTest1, DataLoaderTrain1
-from more_bikes.experiments.experiment import Experiment, Model, Processing
+from more_bikes.experiments.experiment import Execution, Experiment, Model, Processing
 from more_bikes.experiments.params.cv import time_series_split
 from more_bikes.experiments.params.util import SearchStrategy
 from more_bikes.preprocessing.util import split
+from more_bikes.util.log import capture_logging
+from more_bikes.util.results import ResultsSink
 
 
 class Task1AExperiment(Experiment):
@@ -19,39 +27,84 @@ class Task1AExperiment(Experiment):
         processing: Processing = Processing(),
         cv: BaseCrossValidator = time_series_split,
         search: SearchStrategy = "grid",
+        execution: Execution = Execution(),
     ) -> None:
         self._output_path = f"./more_bikes/experiments/task_1a/{model.name}"
-        super().__init__(self._output_path, model, processing, cv, search)
+        super().__init__(self._output_path, model, processing, cv, search, execution)
 
     def run(self, station_id_min=201, station_id_max=275):
         """Run the task 1A experiment."""
         super().run()
 
+        station_ids = range(station_id_min, station_id_max + 1)
+
+        # The stations are independent, so run them in parallel if there are workers.
+        if self._execution.n_jobs in (None, 1):
+            outputs = [self.__run_station_id(station_id) for station_id in station_ids]
+        else:
+            level = self._logger.getEffectiveLevel()
+            # Run each station's search and CV in its worker, so that there is one
+            # level of process parallelism, rather than a pool of workers per worker.
+            experiment = copy(self)
+            experiment._execution = replace(self._execution, n_jobs=1)
+            outputs = []
+            # Run the stations in processes, since each redirects its standard output.
+            with parallel_backend(
+                "loky", inner_max_num_threads=self._execution.threads
+            ):
+                for output, records, cv_logs in Parallel(
+                    n_jobs=self._execution.n_jobs,
+                    pre_dispatch=self._execution.pre_dispatch,
+                )(
+                    delayed(experiment._run_station_worker)(station_id, level)
+                    for station_id in station_ids
+                ):  # type: ignore
+                    for record in records:
+                        self._logger.handle(record)
+                    for cv_log in cv_logs:
+                        with self.write_cv_log() as out:
+                            out.write(cv_log)
+                    outputs.append(output)
+
         resultss: list[DataFrame] = []
 
         best_scores: list[float] = []
 
-        scoress: DataFrame = DataFrame({"station": [], "split": [], "score": []})
-
-        for station_id in range(station_id_min, station_id_max + 1):
-            results, best_score, scores = self.__run_station_id(station_id)
+        scoress = ResultsSink(
+            ["station", "split", "score"], dtype={"station": "int", "split": "int"}
+        )
 
+        for station_id, (results, best_score, scores) in zip(station_ids, outputs):
             resultss.append(results)
 
             best_scores.append(best_score)
 
-            scores["station"] = station_id
-            scoress = concat([scoress, scores], ignore_index=True)
+            scoress.extend(
+                station=station_id, split=scores["split"], score=scores["score"]
+            )
 
         self.data = concat(resultss, ignore_index=True)
 
-        self.scores = scoress
-        self.scores = self.scores.astype({"station": "int", "split": "int"})
+        self.scores = scoress.frame()
 
         self._logger.info("mean score %.3f", sum(best_scores) / len(best_scores))
 
         return self
 
+    def _run_station_worker(
+        self, station_id: int, level: int
+    ) -> tuple[tuple[DataFrame, float, DataFrame], list[LogRecord], list[str]]:
+        """
+        Run a station in a worker, with a copy of the experiment (as configured, e.g.,
+        its output path), capturing its logs and the output of its search for the
+        parent to handle in order.
+        """
+        experiment = copy(self)
+        experiment.cv_logs = []
+        with capture_logging(experiment._logger, level) as records:
+            output = experiment.__run_station_id(station_id)
+        return output, records, experiment.cv_logs
+
     def __run_station_id(self, station_id: int) -> tuple[DataFrame, float, DataFrame]:
         self._logger.info("station id %s", station_id)
 
@@ -61,4 +114,4 @@ class Task1AExperiment(Experiment):
 
         x_test = DataLoaderTest1(station_id).data
 
-        return self._run(x_train, y_train, x_test)
+        return self._run(x_train, y_train, x_test, str(station_id))
@@ -0,0 +1,114 @@
+"""Test the task 1A experiment class."""
+
+from os import getpid, getppid
+from re import sub
+
+from numpy import full
+from pandas.testing import assert_frame_equal
+from sklearn.base import BaseEstimator, RegressorMixin
+from sklearn.pipeline import make_pipeline
+
+from more_bikes.experiments.experiment import Execution, Model
+from more_bikes.preprocessing.bikes_fraction_transformer import BikesFractionTransformer
+from more_bikes.preprocessing.transformed_target_regressor import (
+    TransformedTargetRegressor,
+)
+
+from .task_1a_experiment import Task1AExperiment
+
+
+class ProcessRegressor(RegressorMixin, BaseEstimator):
+    """A mean regressor that records the process (and its parent) that fits it."""
+
+    def __init__(self, path: str = "", shift: float = 0.0):
+        self.path = path
+        self.shift = shift
+
+    def fit(self, _x, y):
+        """Fit."""
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(f"{getpid()} {getppid()}\n")
+        self.mean_ = float(y.mean()) + self.shift
+        return self
+
+    def predict(self, x):
+        """Predict."""
+        return full(len(x), self.mean_)
+
+
+def experiment(
+    tmp_path, n_jobs: int | None, artifacts: bool = False
+) -> Task1AExperiment:
+    """An experiment whose regressor records its processes, writing to `tmp_path`."""
+    experiment_ = Task1AExperiment(
+        model=Model(
+            name="process_test",
+            pipeline=TransformedTargetRegressor(
+                make_pipeline(ProcessRegressor(str(tmp_path / "processes.txt"))),
+                transformer=BikesFractionTransformer(),
+            ),
+            params=[{"regressor__processregressor__shift": [0.0, 0.1]}],
+        ),
+        execution=Execution(n_jobs=n_jobs, artifacts=artifacts),
+    )
+    experiment_._output_path = str(tmp_path)
+    return experiment_
+
+
+def test_task_1a_experiment_nested(tmp_path, monkeypatch):
+    """Test that the stations run in parallel, and their searches in their workers."""
+
+    # Parse no command-line arguments (of the test runner).
+    monkeypatch.setattr("sys.argv", ["test"])
+
+    experiment(tmp_path, 2).run(station_id_min=201, station_id_max=203)
+
+    with open(tmp_path / "processes.txt", encoding="utf-8") as file:
+        processes = [tuple(map(int, line.split())) for line in file]
+
+    # Every fit is in a worker of this process, not of a pool of a worker.
+    assert processes
+    assert all(pid != getpid() and ppid == getpid() for pid, ppid in processes)
+
+
+def test_task_1a_experiment_parallel(tmp_path, monkeypatch):
+    """Test that the stations run in parallel as in sequence, with the same CV log."""
+
+    # Parse no command-line arguments (of the test runner).
+    monkeypatch.setattr("sys.argv", ["test"])
+
+    logs = []
+    experiments = []
+    for n_jobs in [None, 2]:
+        (tmp_path / f"{n_jobs}").mkdir()
+        experiments.append(
+            experiment(tmp_path / f"{n_jobs}", n_jobs).run(
+                station_id_min=201, station_id_max=203
+            )
+        )
+        with open(
+            tmp_path / f"{n_jobs}" / "process_test_cv.log", encoding="utf-8"
+        ) as file:
+            logs.append(sub(r"total time=.*", "", file.read()))
+
+    expected, actual = experiments
+    assert expected.data is not None and actual.data is not None
+    assert_frame_equal(actual.data, expected.data)
+    assert expected.scores is not None and actual.scores is not None
+    assert_frame_equal(actual.scores, expected.scores)
+
+    # The log of the last station's search, as each station's replaces it.
+    assert "[CV 10/10] END regressor__processregressor__shift=0.1" in logs[0]
+    assert logs[1] == logs[0]
+
+
+def test_task_1a_experiment_output_path(tmp_path, monkeypatch):
+    """Test that the workers write to the output path of the experiment."""
+
+    # Parse no command-line arguments (of the test runner).
+    monkeypatch.setattr("sys.argv", ["test"])
+
+    experiment(tmp_path, 2, artifacts=True).run(station_id_min=201, station_id_max=202)
+
+    assert (tmp_path / "process_test_201.joblib").exists()
+    assert (tmp_path / "process_test_202.joblib").exists()
@@ -6,12 +6,8 @@ from sklearn.tree import DecisionTreeRegressor
 
 from more_bikes.experiments.experiment import Model, TaskExperiment
 from more_bikes.experiments.params.decision_tree import params
-from more_bikes.feature_selection.drop import feature_selection_drop
-from more_bikes.feature_selection.variance_threshold import (
-    feature_selection_variance_threshold,
-)
 from more_bikes.preprocessing.bikes_fraction_transformer import BikesFractionTransformer
-from more_bikes.preprocessing.ordinal_transformer import preprocessing_ordinal
+from more_bikes.preprocessing.fused_transformer import make_preprocessing_fused
 from more_bikes.preprocessing.transformed_target_regressor import (
     TransformedTargetRegressor,
 )
@@ -25,11 +21,8 @@ def decision_tree():
             name="decision_tree",
             pipeline=TransformedTargetRegressor(
                 make_pipeline(
-                    # preprocessing
-                    preprocessing_ordinal,
-                    # feature selection
-                    feature_selection_variance_threshold,
-                    feature_selection_drop(
+                    # preprocessing and feature selection
+                    make_preprocessing_fused(
                         [
                             "bikes_3h_diff_avg_full",
                             "bikes_3h_diff_avg_short",
@@ -1,16 +1,12 @@
 """Task 1B: Histogram-based gradient-boosting regression tree."""
 
-from sklearn.ensemble import HistGradientBoostingRegressor
 from sklearn.pipeline import make_pipeline
 
+from more_bikes.experiments.binned import BinnedHGBRegressor
 from more_bikes.experiments.experiment import Model, TaskExperiment
 from more_bikes.experiments.params.hgbr import best_params, params
-from more_bikes.feature_selection.drop import feature_selection_drop
-from more_bikes.feature_selection.variance_threshold import (
-    feature_selection_variance_threshold,
-)
 from more_bikes.preprocessing.bikes_fraction_transformer import BikesFractionTransformer
-from more_bikes.preprocessing.ordinal_transformer import preprocessing_ordinal
+from more_bikes.preprocessing.fused_transformer import make_preprocessing_fused
 from more_bikes.preprocessing.transformed_target_regressor import (
     TransformedTargetRegressor,
 )
@@ -24,11 +20,8 @@ def hgbr():
             name="hgbr",
             pipeline=TransformedTargetRegressor(
                 make_pipeline(
-                    # preprocessing
-                    preprocessing_ordinal,
-                    # feature selection
-                    feature_selection_variance_threshold,
-                    feature_selection_drop(
+                    # preprocessing and feature selection
+                    make_preprocessing_fused(
                         [
                             "bikes_3h_diff_avg_short",
                             "bikes_avg_short",
@@ -36,7 +29,7 @@ def hgbr():
                         ]
                     ),
                     # regression
-                    HistGradientBoostingRegressor(random_state=42),
+                    BinnedHGBRegressor(random_state=42),
                 ),
                 BikesFractionTransformer(),
             ),
@@ -1,15 +1,11 @@
 """Task 1B: LightGBM."""
 
-from lightgbm import LGBMRegressor
 from sklearn.pipeline import make_pipeline
 
+from more_bikes.experiments.binned import BinnedLGBMRegressor
 from more_bikes.experiments.experiment import Model, TaskExperiment
-from more_bikes.feature_selection.drop import feature_selection_drop
-from more_bikes.feature_selection.variance_threshold import (
-    feature_selection_variance_threshold,
-)
 from more_bikes.preprocessing.bikes_fraction_transformer import BikesFractionTransformer
-from more_bikes.preprocessing.ordinal_transformer import preprocessing_ordinal
+from more_bikes.preprocessing.fused_transformer import make_preprocessing_fused
 from more_bikes.preprocessing.transformed_target_regressor import (
     TransformedTargetRegressor,
 )
@@ -23,11 +19,8 @@ def lightgbm():
             name="lightgbm",
             pipeline=TransformedTargetRegressor(
                 make_pipeline(
-                    # preprocessing
-                    preprocessing_ordinal,
-                    # feature selection
-                    feature_selection_variance_threshold,
-                    feature_selection_drop(
+                    # preprocessing and feature selection
+                    make_preprocessing_fused(
                         [
                             "bikes_3h_diff_avg_short",
                             "bikes_avg_short",
@@ -35,34 +28,34 @@ def lightgbm():
                         ]
                     ),
                     # regression
-                    LGBMRegressor(random_state=42),
+                    BinnedLGBMRegressor(random_state=42),
                 ),
                 BikesFractionTransformer(),
             ),
             params=[
                 {
-                    "regressor__lgbmregressor__boosting_type": [
+                    "regressor__binnedlgbmregressor__boosting_type": [
                         "gbdt",
                         "dart",
                     ],
-                    "regressor__lgbmregressor__num_leaves": [
+                    "regressor__binnedlgbmregressor__num_leaves": [
                         15,
                         31,
                         63,
                         127,
                     ],
-                    "regressor__lgbmregressor__max_depth": [
+                    "regressor__binnedlgbmregressor__max_depth": [
                         -1,
                         5,
                         10,
                         20,
                     ],
-                    "regressor__lgbmregressor__learning_rate": [
+                    "regressor__binnedlgbmregressor__learning_rate": [
                         1e-2,
                         1e-1,
                         1.0,
                     ],
-                    "regressor__lgbmregressor__n_estimators": [
+                    "regressor__binnedlgbmregressor__n_estimators": [
                         10,
                         20,
                         50,
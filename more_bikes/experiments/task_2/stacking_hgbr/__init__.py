@@ -3,10 +3,10 @@ Stacking regressor with a histogram-based gradient-boosting regression tree as t
 final estimator.
 """
 
-from sklearn.ensemble import HistGradientBoostingRegressor
 from sklearn.impute import SimpleImputer
 from sklearn.pipeline import make_pipeline
 
+from more_bikes.experiments.binned import BinnedHGBRegressor
 from more_bikes.experiments.experiment import Model, TaskExperiment
 from more_bikes.experiments.params.hgbr import stacking_params
 from more_bikes.experiments.task_2.stacking_regressor import StackingRegressor
@@ -35,7 +35,7 @@ def stacking_hgbr():
                 feature_selection_drop(["wind_speed_avg"]),
                 # regression
                 StackingRegressor(
-                    final_estimator=HistGradientBoostingRegressor(),
+                    final_estimator=BinnedHGBRegressor(),
                 ),
             ),
             params=stacking_params,
@@ -1,14 +1,25 @@
 """Stacking regressor."""
 
-# pylint: disable=dangerous-default-value
+# pylint: disable=dangerous-default-value,attribute-defined-outside-init
 
+from numpy import hstack
 from sklearn.ensemble import StackingRegressor as StackingRegressor_
+from sklearn.ensemble._base import _fit_single_estimator
+from sklearn.utils import Bunch, column_or_1d
+from sklearn.utils.validation import check_is_fitted
 
-from more_bikes.data.model_loader import get_estimators
+from more_bikes.data.model_loader import ModelLoader, get_estimators, get_rlm_engine
 
 
 class StackingRegressor(StackingRegressor_):
-    """A wrapper for `StackingRegressor` with pre-trained RLM models."""
+    """
+    A wrapper for `StackingRegressor` with pre-trained RLM models.
+
+    If `frozen`, the pre-trained models are neither cloned nor cross-validated (their
+    `fit` is a no-op, so out-of-fold predictions equal in-sample predictions): all of
+    their predictions are computed by one batched matrix multiply, and only the final
+    estimator is fitted.
+    """
 
     def __init__(
         self,
@@ -20,6 +31,7 @@ class StackingRegressor(StackingRegressor_):
             "short_full_temp",
             "short_temp",
         ],
+        frozen: bool = True,
         **kwargs,
     ):
         super().__init__(estimators=get_estimators(models), **kwargs)
@@ -28,8 +40,9 @@ class StackingRegressor(StackingRegressor_):
             setattr(self, key, value)
 
         self.models = models
+        self.frozen = frozen
 
-        self._param_names = ["models"] + list(kwargs.keys())
+        self._param_names = ["models", "frozen"] + list(kwargs.keys())
 
     def get_params(self, deep=True):
         return {param: getattr(self, param) for param in self._param_names}
@@ -41,3 +54,44 @@ class StackingRegressor(StackingRegressor_):
         self.estimators = get_estimators(self.models)
 
         return self
+
+    def fit(self, X, y, sample_weight=None):
+        if not self.frozen:
+            return super().fit(X, y, sample_weight)
+
+        y = column_or_1d(y, warn=True)
+
+        names, all_estimators = self._validate_estimators()
+        self._validate_final_estimator()
+
+        self.named_estimators_ = Bunch()
+        self.estimators_ = []
+        for name, estimator in zip(names, all_estimators):
+            if estimator == "drop":
+                self.named_estimators_[name] = "drop"
+                continue
+            if not isinstance(estimator, ModelLoader):
+                raise ValueError(f"Estimator {name} is not a pre-trained RLM model.")
+            self.named_estimators_[name] = estimator
+            self.estimators_.append(estimator)
+
+        self.stack_method_ = ["predict"] * len(self.estimators_)
+
+        _fit_single_estimator(
+            self.final_estimator_, self._transform(X), y, sample_weight=sample_weight
+        )
+
+        return self
+
+    def _transform(self, X):
+        if not self.frozen:
+            return super()._transform(X)
+
+        check_is_fitted(self)
+
+        predictions = get_rlm_engine().predict(
+            X, [estimator.row for estimator in self.estimators_]
+        )
+        self._n_feature_outs = [1] * predictions.shape[1]
+
+        return hstack([predictions, X]) if self.passthrough else predictions
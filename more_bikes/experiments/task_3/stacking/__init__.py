@@ -1,19 +1,15 @@
 """Stacking regressor with a gradient-boosted decision tree and pre-trained linear models."""
 
-from pandas import DataFrame, concat
-from sklearn.ensemble import HistGradientBoostingRegressor
-from sklearn.pipeline import FunctionTransformer, make_pipeline
+from pandas import DataFrame
+from sklearn.pipeline import make_pipeline
 
 from more_bikes.data.data_loader import DataLoaderFullN
-from more_bikes.data.model_loader import get_estimators
+from more_bikes.experiments.binned import BinnedHGBRegressor
 from more_bikes.experiments.experiment import Model, TaskExperiment
 from more_bikes.experiments.params.hgbr import best_params, params
-from more_bikes.feature_selection.drop import feature_selection_drop
-from more_bikes.feature_selection.variance_threshold import (
-    feature_selection_variance_threshold,
-)
 from more_bikes.preprocessing.bikes_fraction_transformer import BikesFractionTransformer
-from more_bikes.preprocessing.ordinal_transformer import preprocessing_ordinal
+from more_bikes.preprocessing.fused_transformer import make_preprocessing_fused
+from more_bikes.preprocessing.rlm_transformer import RLMTransformer
 from more_bikes.preprocessing.transformed_target_regressor import (
     TransformedTargetRegressor,
 )
@@ -22,10 +18,7 @@ from more_bikes.preprocessing.transformed_target_regressor import (
 def feature_eng_rlm(x: DataFrame):
     """For each pre-trained linear model, add a feature whose values are the model's predictions."""
 
-    for name, estimator in get_estimators():
-        x = concat([x, DataFrame(estimator.predict(x), columns=[name])], axis=1)
-
-    return x
+    return RLMTransformer().fit_transform(x)
 
 
 def stacking():
@@ -36,15 +29,12 @@ def stacking():
             name="stacking",
             pipeline=TransformedTargetRegressor(
                 make_pipeline(
-                    # preprocessing
-                    preprocessing_ordinal,
-                    # feature selection
-                    feature_selection_variance_threshold,
-                    feature_selection_drop(["wind_speed_avg"]),
+                    # preprocessing and feature selection
+                    make_preprocessing_fused(["wind_speed_avg"]),
                     # feature engineering
-                    # FunctionTransformer(feature_eng_rlm),
+                    # RLMTransformer(own_station=True),
                     # regression
-                    HistGradientBoostingRegressor(random_state=42),
+                    BinnedHGBRegressor(random_state=42),
                     # DummyRegressor(),
                 ),
                 BikesFractionTransformer(),
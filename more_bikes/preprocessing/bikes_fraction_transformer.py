@@ -1,21 +1,49 @@
 """Transformer that divides `bikes` by `docks`."""
 
+from numpy import array, errstate, float64, ndarray
+from pandas import DataFrame, Series
 from sklearn.base import BaseEstimator, TransformerMixin
 
 from more_bikes.util.array import NDArray
 
 
 class BikesFractionTransformer(BaseEstimator, TransformerMixin):
-    """Divide `bikes` by `docks`."""
+    """
+    Divide `bikes` by `docks`.
+
+    `docks` is the name of the docks column of a DataFrame or its index, which is also
+    the index of the column of an array. The targets of a DataFrame are returned as a
+    Series aligned with its index, and those of an array as an array.
+    """
+
+    def __init__(self, docks: str | int = "docks"):
+        self.docks = docks
 
     def fit(self, _x: NDArray, _y: NDArray):
         """Fit."""
         return self
 
+    def _docks(self, x: DataFrame | NDArray) -> NDArray[float64]:
+        if isinstance(x, DataFrame):
+            docks = (
+                x.iloc[:, self.docks] if isinstance(self.docks, int) else x[self.docks]
+            )
+            return docks.to_numpy(dtype=float64)
+        if isinstance(x, ndarray) and isinstance(self.docks, int):
+            return x[:, self.docks].astype(float64)
+        raise ValueError("The docks column of an array must be an index.")
+
+    def _targets(
+        self, x: DataFrame | NDArray, y: NDArray[float64]
+    ) -> Series | NDArray[float64]:
+        # Divide as arrays, and wrap the targets of a DataFrame once.
+        return Series(y, index=x.index) if isinstance(x, DataFrame) else y
+
     def transform(self, x: NDArray, y: NDArray) -> NDArray:
         """Transform."""
-        return y / x["docks"]
+        with errstate(divide="ignore", invalid="ignore"):
+            return self._targets(x, array(y, dtype=float64) / self._docks(x))
 
     def inverse_transform(self, x: NDArray, y: NDArray) -> NDArray:
         """Inverse transform."""
-        return y * x["docks"]
+        return self._targets(x, array(y, dtype=float64) * self._docks(x))
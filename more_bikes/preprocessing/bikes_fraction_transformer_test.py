@@ -0,0 +1,29 @@
+"""Test the bikes-fraction transformer."""
+
+from numpy import array
+from numpy.testing import assert_allclose
+from pandas import DataFrame, Series
+from pandas.testing import assert_index_equal
+from pytest import raises
+
+from .bikes_fraction_transformer import BikesFractionTransformer
+
+
+def test_bikes_fraction_transformer():
+    """Test that frames and arrays are transformed alike and inversely."""
+
+    x = DataFrame({"station": [1, 1, 2], "docks": [10, 20, 0]}, index=[7, 3, 5])
+    y = Series([5.0, 5.0, 0.0], index=x.index)
+
+    transformer = BikesFractionTransformer().fit(x, y)
+    fraction = transformer.transform(x, y)
+    assert isinstance(fraction, Series)
+    assert_index_equal(fraction.index, x.index)
+    assert_allclose(fraction[:2], [0.5, 0.25])
+    assert_allclose(transformer.inverse_transform(x, fraction)[:2], y[:2])
+
+    transformer = BikesFractionTransformer(docks=1).fit(x.to_numpy(), y)
+    assert_allclose(transformer.transform(x.to_numpy(), y.to_numpy()), fraction)
+
+    with raises(ValueError):
+        BikesFractionTransformer().transform(array([[1, 10]]), array([5.0]))
@@ -0,0 +1,103 @@
+"""A transformer that fuses the ordinal, variance-threshold and drop transformers."""
+
+# pylint: disable=attribute-defined-outside-init
+
+from typing import Any
+
+from numpy import array, empty, float64
+from pandas import Categorical, DataFrame
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_selection import VarianceThreshold
+
+from more_bikes.data.feature import Feature, categorical_features, categories
+from more_bikes.feature_selection.variance_threshold import variance_features
+from more_bikes.preprocessing.ordinal_transformer import is_encoded
+from more_bikes.util.array import NDArray
+
+
+class FusedTransformer(TransformerMixin, BaseEstimator):
+    """
+    Ordinal-encode, select by variance and drop features in one pass.
+
+    The features are those of `preprocessing_ordinal`, then
+    `feature_selection_variance_threshold`, then `feature_selection_drop(drop)`, in
+    the same order, but each transform writes them straight into one contiguous float
+    array, without the intermediate frames of the column transformers.
+    """
+
+    def __init__(
+        self,
+        drop: list[Feature] | None = None,
+        categorical: list[str] | None = None,
+        categories: list[list[Any]] | None = None,
+        variance: list[str] | None = None,
+        threshold: float = 0.0,
+    ):
+        self.drop = drop
+        self.categorical = categorical
+        self.categories = categories
+        self.variance = variance
+        self.threshold = threshold
+
+    def fit(self, X: DataFrame, _y=None):
+        """Fit the variance threshold."""
+        self.feature_names_in_ = array(X.columns, dtype=object)
+        self.n_features_in_ = len(self.feature_names_in_)
+
+        categorical = self.categorical or categorical_features
+        self.encodings_ = dict(zip(categorical, self.categories or categories))
+
+        # The features of the ordinal transformer: the categorical features first.
+        ordinal = list(categorical) + [
+            feature for feature in X.columns if feature not in self.encodings_
+        ]
+
+        self.variance_features_ = list(self.variance or variance_features)
+        self.variance_threshold_ = VarianceThreshold(self.threshold).fit(
+            self._values(X, self.variance_features_)
+        )
+        support = dict(
+            zip(self.variance_features_, self.variance_threshold_.get_support())
+        )
+
+        # The variance transformer puts its features first, then the rest.
+        selected = [
+            feature for feature in self.variance_features_ if support[feature]
+        ] + [feature for feature in ordinal if feature not in support]
+
+        self.features_ = [
+            feature for feature in selected if feature not in (self.drop or [])
+        ]
+
+        return self
+
+    def _values(self, X: DataFrame, features: list[str]) -> NDArray[float64]:
+        values = empty((len(X), len(features)), dtype=float64)
+
+        for index, feature in enumerate(features):
+            if feature in self.encodings_:
+                codes = (
+                    X[feature].to_numpy()
+                    if is_encoded(X[feature])
+                    else Categorical(X[feature], self.encodings_[feature]).codes
+                )
+                if ((codes < 0) | (codes >= len(self.encodings_[feature]))).any():
+                    raise ValueError(f"Found unknown categories in {feature}.")
+                values[:, index] = codes
+            else:
+                values[:, index] = X[feature].to_numpy(float64)
+
+        return values
+
+    def transform(self, X: DataFrame) -> NDArray[float64]:
+        """Transform."""
+        return self._values(X, self.features_)
+
+    def get_feature_names_out(self, _input_features=None):
+        """Get the names of the features."""
+        return array(self.features_, dtype=object)
+
+
+def make_preprocessing_fused(drop: list[Feature] | None = None) -> FusedTransformer:
+    """Ordinal-encode, select by variance and drop features in one pass."""
+    return FusedTransformer(drop)
@@ -0,0 +1,46 @@
+"""Test the fused transformer."""
+
+from numpy import arange, nan
+from numpy.testing import assert_array_equal
+from pandas import DataFrame
+from pytest import raises
+from sklearn.pipeline import make_pipeline
+
+from more_bikes.data.feature import WEEKDAY
+from more_bikes.feature_selection.drop import feature_selection_drop
+from more_bikes.feature_selection.variance_threshold import (
+    feature_selection_variance_threshold,
+    variance_features,
+)
+
+from .fused_transformer import make_preprocessing_fused
+from .ordinal_transformer import preprocessing_ordinal
+
+
+def test_fused_transformer():
+    """Test that the transformer has the outputs of the column transformers."""
+
+    x = DataFrame({feature: arange(7.0) for feature in variance_features})
+    x["docks"] = 20
+    x["station"] = 1
+    x["weekday"] = WEEKDAY
+    x["is_holiday"] = [False, True, False, False, True, False, False]
+    x["bikes_3h"] = [nan, 1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+    x = x.set_index(arange(10, 17))
+
+    drop = ["wind_speed_avg", "bikes_3h"]
+    chain = make_pipeline(
+        preprocessing_ordinal,
+        feature_selection_variance_threshold,
+        feature_selection_drop(drop),
+    ).set_output(transform="pandas")
+    fused = make_preprocessing_fused(drop).set_output(transform="pandas")
+
+    expected, actual = chain.fit_transform(x), fused.fit_transform(x)
+    assert "docks" not in actual.columns
+    assert list(actual.columns) == list(expected.columns)
+    assert_array_equal(actual.index, expected.index)
+    assert_array_equal(actual.to_numpy(), expected.to_numpy(float))
+
+    with raises(ValueError):
+        fused.transform(x.assign(weekday="Someday"))
@@ -1,13 +1,59 @@
 """Ordinal transformer for categorical features."""
 
+# pylint: disable=attribute-defined-outside-init
+
 from typing import Any
 
+from numpy import array, asarray
+from pandas import DataFrame
+from pandas.api.types import is_integer_dtype
 from sklearn.compose import ColumnTransformer
 from sklearn.preprocessing import OrdinalEncoder
 
 from more_bikes.data.feature import categorical_features, categories
 
 
+def is_encoded(x: Any) -> bool:
+    """Whether the categorical features are their ordinal codes already (integers)."""
+    dtypes = x.dtypes if isinstance(x, DataFrame) else [x.dtype]
+    return all(is_integer_dtype(dtype) for dtype in dtypes)
+
+
+class OrdinalCodeEncoder(OrdinalEncoder):
+    """
+    An ordinal encoder that passes through ordinal codes, e.g., from a `DataLoader`
+    with `ReadOptions(encode=True)`, rather than compare their categories again.
+    """
+
+    def fit(self, X, y=None):
+        if not is_encoded(X) or isinstance(self.categories, str):
+            return super().fit(X, y)
+
+        self._check_feature_names(X, reset=True)
+        self._check_n_features(X, reset=True)
+        self.categories_ = [
+            array(category, dtype=object) for category in self.categories
+        ]
+        self._infrequent_enabled = False
+        self._missing_indices = {}
+
+        return self
+
+    def transform(self, X):
+        if not is_encoded(X):
+            return super().transform(X)
+
+        self._check_feature_names(X, reset=False)
+        self._check_n_features(X, reset=False)
+
+        codes = asarray(X, dtype=self.dtype)
+        sizes = array([len(category) for category in self.categories_])
+        if ((codes < 0) | (codes >= sizes)).any():
+            raise ValueError("Found unknown ordinal codes during transform.")
+
+        return codes
+
+
 def make_preprocessing_ordinal(
     name: str = "ordinal",
     categorical_features_: list[str] | None = None,
@@ -20,7 +66,7 @@ def make_preprocessing_ordinal(
         transformers=[
             (
                 name,
-                OrdinalEncoder(categories=categories_),
+                OrdinalCodeEncoder(categories=categories_),
                 categorical_features_,
             ),
         ],
@@ -3,6 +3,7 @@
 from numpy import array
 from numpy.testing import assert_array_equal
 from pandas import DataFrame
+from pytest import raises
 
 from .ordinal_transformer import make_preprocessing_ordinal
 
@@ -68,3 +69,25 @@ def test_ordinal_transformer():
             ]
         ),
     )
+
+
+def test_ordinal_transformer_encoded():
+    """Test that the ordinal transformer passes through ordinal codes."""
+
+    data = DataFrame(
+        {
+            "bikes": [1.0, 2.0, 3.0],
+            "weekday": array([0, 6, 2], dtype="int8"),
+            "is_holiday": array([1, 0, 0], dtype="int8"),
+        }
+    )
+
+    transformer = make_preprocessing_ordinal()
+
+    assert_array_equal(
+        array(transformer.fit_transform(data)),
+        array([[0.0, 1.0, 1.0], [6.0, 0.0, 2.0], [2.0, 0.0, 3.0]]),
+    )
+
+    with raises(ValueError):
+        transformer.transform(data.assign(weekday=array([7, 0, 0], dtype="int8")))
@@ -0,0 +1,87 @@
+"""A transformer that adds the predictions of the pre-trained RLM models as features."""
+
+# pylint: disable=attribute-defined-outside-init
+
+from typing import Any
+
+from numpy import array, float64, full, nan
+from pandas import DataFrame, concat
+from sklearn.base import BaseEstimator, TransformerMixin
+
+from more_bikes.data.model_loader import get_rlm_engine
+
+
+class RLMTransformer(TransformerMixin, BaseEstimator):
+    """
+    Add a feature for each pre-trained RLM model, whose values are its predictions.
+
+    All of the predictions are computed by one matrix product of the RLM engine and
+    added to the features at once. If `own_station`, there is one feature for each
+    model (e.g., `full`), whose values are the predictions of the model of the
+    sample's station (or `nan` if the station has no pre-trained models), rather than
+    one feature for each model of every station (e.g., `full_1`, ..., `full_200`).
+    """
+
+    def __init__(
+        self,
+        models: list[str] | None = None,
+        own_station: bool = False,
+        dtype: Any = float64,
+    ):
+        self.models = models
+        self.own_station = own_station
+        self.dtype = dtype
+
+    def fit(self, X: DataFrame, _y=None):
+        """Fit (the pre-trained models are not fitted)."""
+        self.feature_names_in_ = array(X.columns, dtype=object)
+        self.n_features_in_ = len(self.feature_names_in_)
+
+        engine = get_rlm_engine()
+        self.models_ = [model for model in engine.models if model in self._models()]
+        self.rows_ = engine.rows(models=self.models_)
+        self.names_ = (
+            list(self.models_)
+            if self.own_station
+            else [
+                f"{model}_{station_id}"
+                for station_id in engine.stations
+                for model in self.models_
+            ]
+        )
+
+        return self
+
+    def _models(self) -> list[str]:
+        if not self.models:
+            return get_rlm_engine().models
+        return [self.models] if isinstance(self.models, str) else self.models
+
+    def transform(self, X: DataFrame) -> DataFrame:
+        """Add the predictions of the pre-trained models."""
+        predictions = (
+            self._predict_own_station(X)
+            if self.own_station
+            else get_rlm_engine().predict(X, self.rows_, self.dtype)
+        )
+
+        return concat(
+            [X, DataFrame(predictions, columns=self.names_, index=X.index)], axis=1
+        )
+
+    def _predict_own_station(self, X: DataFrame):
+        engine = get_rlm_engine()
+        predictions = full((len(X), len(self.models_)), nan, dtype=self.dtype)
+
+        station_ids = X["station"].to_numpy()
+        for station_id in set(station_ids.tolist()) & set(engine.stations):
+            samples = station_ids == station_id
+            predictions[samples] = engine.predict(
+                X[samples], engine.rows([station_id], self.models_), self.dtype
+            )
+
+        return predictions
+
+    def get_feature_names_out(self, _input_features=None):
+        """Get the names of the features, with those of the pre-trained models."""
+        return array(list(self.feature_names_in_) + self.names_, dtype=object)
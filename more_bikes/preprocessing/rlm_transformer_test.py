@@ -0,0 +1,41 @@
+"""Test the RLM transformer."""
+
+from numpy import array, float32, nan
+from numpy.testing import assert_allclose
+from pandas import DataFrame
+
+from more_bikes.data.model_loader import RLM_FEATURES, RLMEngine
+
+from . import rlm_transformer
+from .rlm_transformer import RLMTransformer
+
+
+def test_rlm_transformer(monkeypatch):
+    """Test that the transformer adds the predictions of every or own models."""
+
+    # Two stations, each with two models: `bikes_3h` only, and with `temperature`.
+    coef = array(
+        [
+            [1.0, 2.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+            [0.5, 1.0, 0.0, 0.0, 0.0, 0.0, 3.0],
+            [0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0],
+            [0.0, 1.0, 0.0, 0.0, 0.0, 0.0, 1.0],
+        ]
+    )
+    engine = RLMEngine([1, 2], ["full", "full_temp"], coef, coef[:, 1:] != 0)
+    monkeypatch.setattr(rlm_transformer, "get_rlm_engine", lambda: engine)
+
+    x = DataFrame({feature: [0.0, 0.0, 0.0] for feature in RLM_FEATURES})
+    x["station"] = [1, 2, 3]
+    x["bikes_3h"] = [1.0, 2.0, 3.0]
+    x["temperature"] = [10.0, nan, 1.0]
+
+    xt = RLMTransformer().fit_transform(x)
+    assert list(xt.columns[-4:]) == ["full_1", "full_temp_1", "full_2", "full_temp_2"]
+    assert_allclose(xt["full_1"], [3.0, 5.0, 7.0])
+    assert_allclose(xt["full_temp_2"], [11.0, nan, 4.0])
+
+    xt = RLMTransformer("full_temp", own_station=True, dtype=float32).fit_transform(x)
+    assert list(xt.columns) == list(x.columns) + ["full_temp"]
+    assert xt["full_temp"].dtype == float32
+    assert_allclose(xt["full_temp"], [31.5, nan, nan])
@@ -24,6 +24,18 @@ def create_parser() -> ArgumentParser:
         type=str,
         default=[],
     )
+    parser.add_argument(
+        "-p",
+        "--predict-only",
+        action="store_true",
+        default=None,
+    )
+    parser.add_argument(
+        "-a",
+        "--artifacts",
+        action="store_true",
+        default=None,
+    )
 
     return parser
 
@@ -49,3 +61,19 @@ def get_task_args() -> list[str]:
     assert all(isinstance(experiment, str) for experiment in args.experiment)
 
     return args.experiment
+
+
+def get_execution_args() -> dict[str, bool]:
+    """Get the execution command-line arguments that are set, by their names."""
+    args = argument_parser.parse_args()
+
+    # Unset flags are `None`, so that they keep the experiment's values.
+    changes = {
+        name: getattr(args, name)
+        for name in ["predict_only", "artifacts"]
+        if getattr(args, name) is not None
+    }
+
+    assert all(isinstance(value, bool) for value in changes.values())
+
+    return changes
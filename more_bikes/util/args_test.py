@@ -0,0 +1,13 @@
+"""Test the command-line arguments."""
+
+from .args import get_execution_args
+
+
+def test_get_execution_args(monkeypatch):
+    """Test that only the execution arguments that are set are returned."""
+
+    monkeypatch.setattr("sys.argv", ["test"])
+    assert not get_execution_args()
+
+    monkeypatch.setattr("sys.argv", ["test", "--artifacts"])
+    assert get_execution_args() == {"artifacts": True}
@@ -1,15 +1,19 @@
 """Logging utility functions."""
 
+from contextlib import contextmanager
 from logging import (
     CRITICAL,
     FileHandler,
     Formatter,
+    Handler,
     Logger,
+    LogRecord,
     NullHandler,
     StreamHandler,
     getLogger,
 )
 from os import getcwd
+from typing import Iterator
 
 from more_bikes.util.args import get_logging_args
 
@@ -23,7 +27,11 @@ def disable_logging(name: str) -> None:
 
 
 def create_logger(name: str, path: str = getcwd()) -> Logger:
-    """Create a logger."""
+    """Create a logger, or get it if it has been created (e.g., by an experiment)."""
+    logger = getLogger(name)
+    if logger.handlers:
+        return logger
+
     file, level = get_logging_args()
 
     formatter = Formatter("%(asctime)s %(name)s %(message)s")
@@ -32,7 +40,6 @@ def create_logger(name: str, path: str = getcwd()) -> Logger:
     stream_handler.setLevel(level.upper())
     stream_handler.setFormatter(formatter)
 
-    logger = getLogger(name)
     logger.setLevel(level.upper())
     logger.addHandler(stream_handler)
 
@@ -43,3 +50,38 @@ def create_logger(name: str, path: str = getcwd()) -> Logger:
         logger.addHandler(file_handler)
 
     return logger
+
+
+class RecordHandler(Handler):
+    """A handler that keeps the records that it handles, ready to pickle."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[LogRecord] = []
+
+    def emit(self, record: LogRecord) -> None:
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        self.records.append(record)
+
+
+@contextmanager
+def capture_logging(logger: Logger, level: int) -> Iterator[list[LogRecord]]:
+    """
+    Capture the records of a logger instead of handling them, e.g., in a worker process
+    whose records should be handled by the parent process.
+    """
+    handler = RecordHandler()
+    handlers, propagate, level_ = logger.handlers, logger.propagate, logger.level
+
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(level)
+
+    try:
+        yield handler.records
+    finally:
+        logger.handlers = handlers
+        logger.propagate = propagate
+        logger.setLevel(level_)
@@ -0,0 +1,161 @@
+"""In-memory caches of function results, for pipelines."""
+
+from collections import OrderedDict
+from copy import deepcopy
+from functools import partial, wraps
+from hashlib import sha1
+from typing import Any, Callable
+from uuid import uuid4
+from weakref import ref
+
+from joblib import hash as hash_
+from numpy import ndarray
+from pandas import DataFrame, Series
+from pandas.util import hash_pandas_object
+from sklearn.base import BaseEstimator
+
+
+def fingerprint(value: Any) -> Any:
+    """
+    A hashable stand-in for a DataFrame or Series: its labels, dtypes and a vectorised
+    hash of its values, which is much faster than pickling its (object) columns.
+    """
+    if isinstance(value, DataFrame):
+        labels, dtypes = list(value.columns), list(map(str, value.dtypes))
+    elif isinstance(value, Series):
+        labels, dtypes = [value.name], [str(value.dtype)]
+    else:
+        return value
+
+    return (
+        type(value).__name__,
+        repr(labels),
+        repr(dtypes),
+        sha1(hash_pandas_object(value).to_numpy().tobytes()).hexdigest(),
+    )
+
+
+class MemoryCache:
+    """
+    A `joblib.Memory`-like cache that keeps the results of functions in memory.
+
+    As the `memory` of a `Pipeline`, it caches the fitted transformers and transformed
+    data of each step by the step's parameters and input, so that the candidates of a
+    search fit the shared steps once per fold. Clones of a pipeline share the cache.
+    It pickles (e.g., to a worker process) by its key, so the candidates in a worker
+    share that worker's cache, and each process keeps only its latest cache (e.g., of
+    its latest search).
+
+    Like `joblib.Memory`, each call returns a copy of the cached data and estimators,
+    so that a caller that changes them (e.g., in place) does not change the cache.
+    """
+
+    def __init__(self, maxsize: int = 64, key: str | None = None) -> None:
+        self.maxsize = maxsize
+        self.key = uuid4().hex if key is None else key
+        self._results: OrderedDict[str, Any] = OrderedDict()
+
+        # The keys of the results that are inputs in turn (e.g., the transformed data
+        # of the previous step), by a weak reference to each, so that they are not
+        # hashed again.
+        self._outputs: dict[int, tuple[ref, str]] = {}
+
+    def __deepcopy__(self, _memo: dict[int, Any]) -> "MemoryCache":
+        return self
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Pickle by the key, rather than the results.
+        return (_shared_cache, (type(self), self.maxsize, self.key))
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def clear(self) -> None:
+        """Forget every result."""
+        self._results.clear()
+        self._outputs.clear()
+
+    def _fingerprint(self, value: Any) -> Any:
+        output, key = self._outputs.get(id(value), (None, None))
+        if output is not None and output() is value:
+            return key
+        return fingerprint(value)
+
+    def _output(self, result: Any, key: str) -> Any:
+        """A copy of a result, whose outputs are known by the key of the result."""
+        outputs = [_copy(output) for output in _outputs(result)]
+
+        for index, output in enumerate(outputs):
+            try:
+                self._outputs[id(output)] = (
+                    ref(output, partial(self._forget, id(output))),
+                    f"{key}:{index}",
+                )
+            except TypeError:
+                # E.g., `None`, which cannot be weakly referenced.
+                pass
+
+        return tuple(outputs) if isinstance(result, tuple) else outputs[0]
+
+    def _forget(self, id_: int, output: ref) -> None:
+        """Forget an output that no longer exists, before its `id` can be reused."""
+        if self._outputs.get(id_, (None, None))[0] is output:
+            del self._outputs[id_]
+
+    def cache(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Cache the results of a function by its arguments."""
+
+        @wraps(func)
+        def cached(*args: Any, **kwargs: Any) -> Any:
+            key = hash_(
+                (
+                    func.__module__,
+                    func.__qualname__,
+                    [self._fingerprint(arg) for arg in args],
+                    {name: self._fingerprint(arg) for name, arg in kwargs.items()},
+                )
+            )
+
+            if key in self._results:
+                self._results.move_to_end(key)
+                return self._output(self._results[key], key)
+
+            result = func(*args, **kwargs)
+
+            self._results[key] = result
+            if len(self._results) > self.maxsize:
+                self._results.popitem(last=False)
+
+            return self._output(result, key)
+
+        return cached
+
+
+# The latest cache of each type in this process.
+_caches: dict[type[MemoryCache], MemoryCache] = {}
+
+
+def _shared_cache(type_: type[MemoryCache], maxsize: int, key: str) -> MemoryCache:
+    """This process's cache of a key, which replaces its previous cache of the type."""
+    cache = _caches.get(type_)
+    if cache is None or cache.key != key:
+        if cache is not None:
+            cache.clear()
+        cache = _caches[type_] = type_(maxsize, key)
+    return cache
+
+
+def _outputs(result: Any) -> list[Any]:
+    return list(result) if isinstance(result, tuple) else [result]
+
+
+def _copy(value: Any) -> Any:
+    """A copy of cached data or an estimator, or the value itself otherwise."""
+    if isinstance(value, ndarray):
+        # Keep the layout, e.g., of Fortran-ordered binned data.
+        return value.copy(order="K")
+    if isinstance(value, (DataFrame, Series)):
+        return value.copy()
+    if isinstance(value, BaseEstimator):
+        return deepcopy(value)
+    return value
@@ -0,0 +1,102 @@
+"""Test the in-memory caches."""
+
+from os import getpid
+
+from numpy import arange
+from numpy.testing import assert_allclose
+from pandas import DataFrame, Series
+from pandas.testing import assert_frame_equal
+from sklearn.base import BaseEstimator, TransformerMixin, clone
+from sklearn.feature_selection import VarianceThreshold
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import GridSearchCV, TimeSeriesSplit
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+from .memory import MemoryCache
+
+
+class FitRecorder(TransformerMixin, BaseEstimator):
+    """An identity transformer that records the process of each fit in a file."""
+
+    def __init__(self, path: str = ""):
+        self.path = path
+
+    def fit(self, _x, _y=None):
+        """Fit."""
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(f"{getpid()}\n")
+        return self
+
+    def transform(self, x):
+        """Transform."""
+        return x
+
+
+def test_memory_cache():
+    """Test that a search fits the shared steps once per fold and parameters."""
+
+    x = DataFrame({"a": arange(60.0), "b": arange(60.0) % 7, "c": 1.0})
+    y = Series(2 * x["a"] - x["b"])
+    cv = TimeSeriesSplit(n_splits=3)
+
+    memory = MemoryCache()
+    pipeline = make_pipeline(VarianceThreshold(), StandardScaler(), Ridge())
+    params = {"ridge__alpha": [0.1, 1.0, 10.0], "standardscaler__with_std": [True]}
+
+    cached = GridSearchCV(clone(pipeline).set_params(memory=memory), params, cv=cv)
+    cached.fit(x, y)
+    uncached = GridSearchCV(pipeline, params, cv=cv).fit(x, y)
+
+    # Two steps for each of three folds and the refit.
+    assert len(memory) == 2 * (3 + 1)
+    assert_allclose(
+        cached.cv_results_["mean_test_score"], uncached.cv_results_["mean_test_score"]
+    )
+    assert clone(cached.estimator).memory is memory
+
+
+def test_memory_cache_copies():
+    """Test that the cache returns copies, and forgets them once they are collected."""
+
+    memory = MemoryCache()
+    calls: list[int] = []
+
+    @memory.cache
+    def double(x: DataFrame) -> DataFrame:
+        calls.append(len(x))
+        return 2 * x
+
+    x = DataFrame({"a": [1.0, 2.0]})
+
+    # Changing a result in place does not change the cache.
+    double(x)["a"] = 0.0
+    assert_frame_equal(double(x), 2 * x)
+    assert len(calls) == 1
+
+    # A result is known as an input by its key until it is collected.
+    y = double(x)
+    double(y)
+    assert len(memory._outputs) == 1
+
+    del y
+    assert len(memory._outputs) == 0
+
+
+def test_memory_cache_workers(tmp_path):
+    """Test that the candidates in each worker process share its cache."""
+
+    x = DataFrame({"a": arange(60.0), "b": arange(60.0) % 7})
+    y = Series(2 * x["a"] - x["b"])
+    path = tmp_path / "fits.txt"
+
+    pipeline = make_pipeline(FitRecorder(str(path)), Ridge(), memory=MemoryCache())
+    params = {"ridge__alpha": [0.01, 0.1, 1.0, 10.0, 100.0, 1000.0]}
+    GridSearchCV(pipeline, params, cv=TimeSeriesSplit(n_splits=3), n_jobs=2).fit(x, y)
+
+    with open(path, encoding="utf-8") as file:
+        pids = file.read().split()
+
+    # At most once per fold in each worker (rather than once per candidate and fold),
+    # and once for the refit.
+    assert len(pids) <= 3 * len(set(pids) - {str(getpid())}) + 1
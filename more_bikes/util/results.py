@@ -0,0 +1,71 @@
+"""Sinks that accumulate rows of results, e.g., scores by station and split."""
+
+from collections.abc import Sized
+from typing import Any, Mapping, Sequence
+
+from pandas import DataFrame
+
+
+class ResultsSink:
+    """
+    Rows of results, buffered by column and materialised as a DataFrame once.
+
+    Appending a row is constant-time, unlike concatenating DataFrames in a loop. If
+    there is a `path`, the rows are also streamed to it as a CSV as they arrive, so
+    the results of a long loop are kept if it dies.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        path: str | None = None,
+        dtype: Mapping[str, Any] | None = None,
+    ) -> None:
+        self.columns = list(columns)
+        self.path = path
+        self.dtype = dict(dtype or {})
+        self._buffers: dict[str, list[Any]] = {column: [] for column in self.columns}
+
+        if self.path is not None:
+            DataFrame(columns=self.columns).to_csv(self.path, index=False)
+
+    def __len__(self) -> int:
+        return len(self._buffers[self.columns[0]]) if self.columns else 0
+
+    def extend(self, **values: Any) -> None:
+        """
+        Append rows: each value is a sequence of the values of the rows (e.g., scores
+        by split), or a scalar that is the same for every row (e.g., the station).
+        """
+        lengths = {
+            len(value)
+            for value in values.values()
+            if isinstance(value, Sized) and not isinstance(value, str)
+        }
+        if len(lengths) > 1:
+            raise ValueError(f"The values have different lengths: {sorted(lengths)}.")
+        length = lengths.pop() if lengths else 1
+
+        rows: dict[str, list[Any]] = {}
+        for column in self.columns:
+            value = values[column]
+            rows[column] = (
+                list(value)
+                if isinstance(value, Sized) and not isinstance(value, str)
+                else [value] * length
+            )
+            self._buffers[column].extend(rows[column])
+
+        if self.path is not None:
+            self._frame(rows).to_csv(self.path, mode="a", header=False, index=False)
+
+    def append(self, **values: Any) -> None:
+        """Append a row."""
+        self.extend(**{column: [value] for column, value in values.items()})
+
+    def frame(self) -> DataFrame:
+        """The rows so far, as a DataFrame."""
+        return self._frame(self._buffers)
+
+    def _frame(self, rows: Mapping[str, list[Any]]) -> DataFrame:
+        return DataFrame(rows, columns=self.columns).astype(self.dtype)
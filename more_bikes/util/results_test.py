@@ -0,0 +1,26 @@
+"""Test the sinks of results."""
+
+from pandas import read_csv
+from pandas.testing import assert_frame_equal
+from pytest import raises
+
+from .results import ResultsSink
+
+
+def test_results_sink(tmp_path):
+    """Test that rows are broadcast, typed and streamed to the CSV."""
+
+    path = str(tmp_path / "scores.csv")
+    sink = ResultsSink(["station", "split", "score"], path, {"station": "int"})
+
+    sink.extend(station=201, split=[0, 1], score=[1.5, 2.5])
+    sink.append(station=202, split=0, score=3.5)
+
+    frame = sink.frame()
+    assert len(sink) == 3
+    assert list(frame["station"]) == [201, 201, 202]
+    assert frame["station"].dtype == "int64"
+    assert_frame_equal(read_csv(path), frame)
+
+    with raises(ValueError):
+        sink.extend(station=203, split=[0, 1], score=[1.0])
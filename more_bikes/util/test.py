@@ -5,10 +5,12 @@
 from itertools import combinations
 
 from numpy import array
-from pandas import DataFrame, concat, read_csv
+from pandas import read_csv
 from scikit_posthocs import posthoc_nemenyi_friedman
 from scipy.stats import friedmanchisquare, ttest_rel
 
+from more_bikes.util.results import ResultsSink
+
 UTIL = "more_bikes/util"
 
 
@@ -234,55 +236,38 @@ if __name__ == "__main__":
 
     P = 0.05
 
-    results_1a = DataFrame(
-        {
-            "model1": [],
-            "model2": [],
-            "station": [],
-            "statistic": [],
-            "pvalue": [],
-            "model": [],
-            "significant": [],
-        }
+    results_1a = ResultsSink(
+        [
+            "model1",
+            "model2",
+            "station",
+            "statistic",
+            "pvalue",
+            "model",
+            "significant",
+        ],
+        dtype={"station": int, "significant": bool},
     )
 
     for pair in combinations(["baseline", "decision_tree", "hgbr"], 2):
         statistics, pvalues = test_task_1a(*pair)
 
         for station, statistic, pvalue in zip(range(201, 276), statistics, pvalues):
-            results_1a = concat(
-                [
-                    results_1a,
-                    DataFrame(
-                        {
-                            "model1": [pair[0]],
-                            "model2": [pair[1]],
-                            "station": [station],
-                            "statistic": [statistic],
-                            "pvalue": [pvalue],
-                            "model": [pair[0] if statistic < 0 else pair[1]],
-                            "significant": [pvalue < P],
-                        }
-                    ),
-                ],
-                ignore_index=True,
+            results_1a.append(
+                model1=pair[0],
+                model2=pair[1],
+                station=station,
+                statistic=statistic,
+                pvalue=pvalue,
+                model=pair[0] if statistic < 0 else pair[1],
+                significant=pvalue < P,
             )
 
-    results_1a["station"] = results_1a["station"].astype(int)
-
-    results_1a["significant"] = results_1a["significant"].astype(bool)
-
-    results_1a.to_csv(f"{UTIL}/test_results_1a.csv", index=False)
+    results_1a.frame().to_csv(f"{UTIL}/test_results_1a.csv", index=False)
 
-    results_1b = DataFrame(
-        {
-            "model1": [],
-            "model2": [],
-            "statistic": [],
-            "pvalue": [],
-            "model": [],
-            "significant": [],
-        }
+    results_1b = ResultsSink(
+        ["model1", "model2", "statistic", "pvalue", "model", "significant"],
+        dtype={"significant": bool},
     )
 
     for pair in combinations(
@@ -290,38 +275,29 @@ if __name__ == "__main__":
     ):
         statistic, pvalue = t_test_task("task_1b", "task_1b", *pair)
 
-        results_1b = concat(
-            [
-                results_1b,
-                DataFrame(
-                    {
-                        "model1": [pair[0]],
-                        "model2": [pair[1]],
-                        "statistic": [statistic],
-                        "pvalue": [pvalue],
-                        "model": [pair[0] if statistic < 0 else pair[1]],
-                        "significant": [pvalue < P],
-                    }
-                ),
-            ],
-            ignore_index=True,
+        results_1b.append(
+            model1=pair[0],
+            model2=pair[1],
+            statistic=statistic,
+            pvalue=pvalue,
+            model=pair[0] if statistic < 0 else pair[1],
+            significant=pvalue < P,
         )
 
-    results_1b["significant"] = results_1b["significant"].astype(bool)
-
-    results_1b.to_csv(f"{UTIL}/test_results_1b.csv", index=False)
-
-    results_2 = DataFrame(
-        {
-            "task1": [],
-            "model1": [],
-            "task2": [],
-            "model2": [],
-            "statistic": [],
-            "pvalue": [],
-            "model": [],
-            "significant": [],
-        }
+    results_1b.frame().to_csv(f"{UTIL}/test_results_1b.csv", index=False)
+
+    results_2 = ResultsSink(
+        [
+            "task1",
+            "model1",
+            "task2",
+            "model2",
+            "statistic",
+            "pvalue",
+            "model",
+            "significant",
+        ],
+        dtype={"significant": bool},
     )
 
     experiments_1b = (
@@ -346,28 +322,18 @@ if __name__ == "__main__":
             pair2[1][1],
         )
 
-        results_2 = concat(
-            [
-                results_2,
-                DataFrame(
-                    {
-                        "task1": [pair2[0][0]],
-                        "model1": [pair2[0][1]],
-                        "task2": [pair2[1][0]],
-                        "model2": [pair2[1][1]],
-                        "statistic": [statistic],
-                        "pvalue": [pvalue],
-                        "model": [pair2[0][1] if statistic < 0 else pair2[1][1]],
-                        "significant": [pvalue < P],
-                    }
-                ),
-            ],
-            ignore_index=True,
+        results_2.append(
+            task1=pair2[0][0],
+            model1=pair2[0][1],
+            task2=pair2[1][0],
+            model2=pair2[1][1],
+            statistic=statistic,
+            pvalue=pvalue,
+            model=pair2[0][1] if statistic < 0 else pair2[1][1],
+            significant=pvalue < P,
         )
 
-    results_2["significant"] = results_2["significant"].astype(bool)
-
-    results_2.to_csv(f"{UTIL}/test_results_2.csv", index=False)
+    results_2.frame().to_csv(f"{UTIL}/test_results_2.csv", index=False)
 
     friedman_test_task(experiments_1b, "1b")
     friedman_test_task(experiments_2, "2")